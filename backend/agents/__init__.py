@@ -1,21 +1,36 @@
 """
 Agent implementations for the Code Review Agent system.
+
+Agents are imported lazily on first attribute access (PEP 562), so importing
+one agent does not pull in every other agent module.
 """
 
-from .base_agent import BaseCodeReviewAgent
-from .best_practices_agent import BestPracticesAgent
-from .documentation_agent import DocumentationAgent
-from .performance_agent import PerformanceAgent
-from .security_agent import SecurityAgent
-from .style_agent import StyleAgent
-from .syntax_analyzer import SyntaxAnalyzerAgent
-
-__all__ = [
-    "BaseCodeReviewAgent",
-    "SyntaxAnalyzerAgent",
-    "SecurityAgent",
-    "PerformanceAgent",
-    "StyleAgent",
-    "BestPracticesAgent",
-    "DocumentationAgent",
-]
+import importlib
+
+_LAZY_EXPORTS = {
+    "BaseCodeReviewAgent": ".base_agent",
+    "SyntaxAnalyzerAgent": ".syntax_analyzer",
+    "SecurityAgent": ".security_agent",
+    "PerformanceAgent": ".performance_agent",
+    "StyleAgent": ".style_agent",
+    "BestPracticesAgent": ".best_practices_agent",
+    "DocumentationAgent": ".documentation_agent",
+    "CombinedReviewAgent": ".combined_agent",
+    "run_all_parallel": ".base_agent",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,58 @@
+"""
+Shared parsing of free-form LLM review text into issue dictionaries.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Pattern
+
+_LINE_NUM_RE = re.compile(r"line\s+(\d+)")
+
+
+def extract_issues(
+    analysis_text: str,
+    marker_re: Pattern[str],
+    new_issue: Callable[[str, str], Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Split LLM review text into issues in a single pass.
+
+    A line whose lowercased text matches marker_re starts a new issue, built
+    by new_issue(line, line_lower). Following lines extend its message, and
+    a "line N" reference among them sets the issue's line.
+
+    Args:
+        analysis_text: Text returned by the LLM
+        marker_re: Pattern recognising the start of an issue
+        new_issue: Builds the issue from the marker line and its lowercased
+            text
+
+    Returns:
+        Issues in response order
+    """
+    issues = []
+    current_issue = None
+    message_parts: List[str] = []
+
+    for line in analysis_text.split("\n"):
+        line_lower = line.lower()
+
+        if marker_re.search(line_lower):
+            if current_issue:
+                current_issue["message"] = " ".join(message_parts)
+                issues.append(current_issue)
+
+            current_issue = new_issue(line, line_lower)
+            message_parts = [line.strip()]
+        elif current_issue:
+            # Try to extract line number
+            if "line" in line_lower:
+                line_match = _LINE_NUM_RE.search(line_lower)
+                if line_match:
+                    current_issue["line"] = int(line_match.group(1))
+            message_parts.append(line.strip())
+
+    if current_issue:
+        current_issue["message"] = " ".join(message_parts)
+        issues.append(current_issue)
+
+    return issues
@@ -5,8 +5,15 @@ Provides common functionality like LLM initialization, prompt templates,
 and error handling that all code review agents share.
 """
 
+import asyncio
+import copy
+import hashlib
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from functools import cached_property, lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
 from langchain_core.output_parsers import StrOutputParser
@@ -14,6 +21,75 @@ from langchain_core.prompts import ChatPromptTemplate
 
 load_dotenv()
 
+# Number of review results each agent keeps for exact repeats
+REVIEW_CACHE_SIZE = 128
+
+# Review parameters that are derived from the code itself (shared between
+# agents to save work) and so never change the result
+_DERIVED_REVIEW_PARAMS = frozenset({"ast_result", "lines"})
+
+# Budget for the code embedded in a prompt, estimated at CHARS_PER_TOKEN
+# characters per token so no tokenizer call is needed
+MAX_CODE_TOKENS = int(os.getenv("MAX_CODE_TOKENS", "200000"))
+CHARS_PER_TOKEN = 4
+
+
+def _configure_llm_cache() -> None:
+    """
+    Enable LangChain's global LLM response cache when CODE_REVIEW_CACHE=1.
+
+    Uses Redis when REDIS_URL is set (shared between workers), otherwise a
+    local SQLite file at LLM_CACHE_PATH. Cache keys cover the full prompt and
+    model settings, so edited prompts never hit stale entries.
+    """
+    if os.getenv("CODE_REVIEW_CACHE") != "1":
+        return
+
+    from langchain_core.globals import set_llm_cache
+
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        import redis
+        from langchain_community.cache import RedisCache
+
+        set_llm_cache(RedisCache(redis.Redis.from_url(redis_url)))
+    else:
+        from langchain_community.cache import SQLiteCache
+
+        set_llm_cache(
+            SQLiteCache(database_path=os.getenv("LLM_CACHE_PATH", ".llm_cache.db"))
+        )
+
+
+_configure_llm_cache()
+
+# (result index, review cache key, _prepare_review state) of a batched review
+_PendingReview = Tuple[int, str, Dict[str, Any]]
+
+# Output parsing is stateless, so every agent chain shares one parser
+_PARSER = StrOutputParser()
+
+
+@lru_cache(maxsize=64)
+def _build_prompt(system_prompt: str) -> ChatPromptTemplate:
+    """Build (once per system prompt) the agent's chat prompt template."""
+    # Agents keep all static instructions in the system prompt so every
+    # request shares the same leading tokens, which providers with prefix
+    # caching (e.g. Gemini implicit caching) reuse; only the input varies.
+    return ChatPromptTemplate.from_messages(
+        [("system", system_prompt), ("user", "{input}")]
+    )
+
+
+@lru_cache(maxsize=32)
+def _get_llm(
+    model_name: Optional[str], temperature: float, api_key: Optional[str]
+) -> Any:
+    """Create (once per configuration) the chat model shared by agents."""
+    from ..utils.gemini_client import create_llm
+
+    return create_llm(model_name=model_name, temperature=temperature, api_key=api_key)
+
 
 class BaseCodeReviewAgent(ABC):
     """
@@ -47,54 +123,444 @@ class BaseCodeReviewAgent(ABC):
         self.role = role
         self.system_prompt = system_prompt
 
-        # Initialize LLM
-        from ..utils.gemini_client import create_llm
-
-        self.llm = create_llm(
-            model_name=model_name, temperature=temperature, api_key=api_key
-        )
+        # The LLM and chain are built on first use (see llm and chain), so
+        # reviews answered from the cache or by the local scan never need one
+        self._llm_settings = (model_name, temperature, api_key)
 
         # Build prompt template
-        self.prompt_template = ChatPromptTemplate.from_messages(
-            [("system", system_prompt), ("user", "{input}")]
-        )
+        self.prompt_template = _build_prompt(system_prompt)
+        self._uncached_chain = None
 
-        # Build chain
-        self.chain = self.prompt_template | self.llm | StrOutputParser()
+        # Recent review results, keyed by _review_cache_key
+        self._review_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # One agent can serve several threads (the orchestrator's pool, or a
+        # Streamlit orchestrator shared between sessions)
+        self._review_cache_lock = threading.Lock()
 
-    def _invoke(self, input_text: str, **kwargs) -> str:
+    @cached_property
+    def llm(self) -> Any:
+        """Chat model shared by agents with the same settings, created on first use."""
+        return _get_llm(*self._llm_settings)
+
+    @cached_property
+    def chain(self) -> Any:
+        """Prompt | LLM | parser chain, built on first use."""
+        return self.prompt_template | self.llm | _PARSER
+
+    def _get_chain(self, cache: bool = True):
+        """Return the agent's chain, or one that bypasses the LLM cache."""
+        if cache:
+            return self.chain
+
+        if self._uncached_chain is None:
+            llm = self.llm
+            if hasattr(llm, "model_copy"):
+                llm = llm.model_copy(update={"cache": False})
+            self._uncached_chain = self.prompt_template | llm | _PARSER
+        return self._uncached_chain
+
+    def _invoke(self, input_text: str, cache: bool = True, **kwargs) -> str:
         """
         Invoke the agent's chain with input and optional context.
 
         Args:
             input_text: The input text for the agent
+            cache: Whether LangChain's LLM response cache may be used
             **kwargs: Additional context variables for the prompt
 
         Returns:
             Agent's response as string
         """
         try:
-            result = self.chain.invoke({"input": input_text, **kwargs})
+            result = self._get_chain(cache).invoke({"input": input_text, **kwargs})
             return result
         except Exception as e:
             error_msg = f"[{self.role}] Error processing request: {str(e)}"
             raise RuntimeError(error_msg) from e
 
-    @abstractmethod
-    def review(self, code: str, language: str = "python", **kwargs) -> Dict[str, Any]:
+    async def _ainvoke(self, input_text: str, cache: bool = True, **kwargs) -> str:
+        """
+        Asynchronously invoke the agent's chain with input and optional context.
+
+        Args:
+            input_text: The input text for the agent
+            cache: Whether LangChain's LLM response cache may be used
+            **kwargs: Additional context variables for the prompt
+
+        Returns:
+            Agent's response as string
+        """
+        try:
+            return await self._get_chain(cache).ainvoke({"input": input_text, **kwargs})
+        except Exception as e:
+            error_msg = f"[{self.role}] Error processing request: {str(e)}"
+            raise RuntimeError(error_msg) from e
+
+    async def _astream(
+        self, input_text: str, cache: bool = True, **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream the agent's response chunk by chunk as the LLM produces it.
+
+        Args:
+            input_text: The input text for the agent
+            cache: Whether LangChain's LLM response cache may be used
+            **kwargs: Additional context variables for the prompt
+
+        Yields:
+            Response text chunks
+        """
+        try:
+            chain = self._get_chain(cache)
+            async for chunk in chain.astream({"input": input_text, **kwargs}):
+                yield chunk
+        except Exception as e:
+            error_msg = f"[{self.role}] Error processing request: {str(e)}"
+            raise RuntimeError(error_msg) from e
+
+    def review(
+        self, code: str, language: str = "python", cache: bool = True, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Review code.
+
+        Args:
+            code: The code to review
+            language: Programming language (python, javascript, etc.)
+            cache: Reuse cached results for identical code; pass False when
+                a fresh LLM sample is required
+            **kwargs: Additional parameters, e.g. a precomputed ast_result
+                shared between agents
+
+        Returns:
+            Dictionary with review results and findings
+        """
+        cache_key = self._review_cache_key(code, language, kwargs)
+        cached = self._get_cached_review(cache_key) if cache else None
+        if cached is not None:
+            return cached
+
+        analysis_input, state = self._prepare_review(code, language, **kwargs)
+        if analysis_input is None:
+            return self._skipped_review(state)
+
+        analysis_result = self._invoke(analysis_input, cache=cache)
+        result = self._finalize_review(analysis_result, state)
+        self._cache_review(cache_key, result)
+        return result
+
+    async def areview(
+        self, code: str, language: str = "python", cache: bool = True, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Review code without blocking the event loop on the LLM call.
+
+        Args:
+            code: The code to review
+            language: Programming language (python, javascript, etc.)
+            cache: Reuse cached results for identical code; pass False when
+                a fresh LLM sample is required
+            **kwargs: Additional parameters, e.g. a precomputed ast_result
+                shared between agents
+
+        Returns:
+            Dictionary with review results and findings
+        """
+        cache_key = self._review_cache_key(code, language, kwargs)
+        cached = self._get_cached_review(cache_key) if cache else None
+        if cached is not None:
+            return cached
+
+        analysis_input, state = self._prepare_review(code, language, **kwargs)
+        if analysis_input is None:
+            return self._skipped_review(state)
+
+        analysis_result = await self._ainvoke(analysis_input, cache=cache)
+        result = self._finalize_review(analysis_result, state)
+        self._cache_review(cache_key, result)
+        return result
+
+    async def areview_stream(
+        self, code: str, language: str = "python", cache: bool = True, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Review code. Must be implemented by subclasses.
+        Review code, yielding the LLM's tokens as they arrive.
 
         Args:
             code: The code to review
             language: Programming language (python, javascript, etc.)
+            cache: Reuse cached results for identical code; pass False when
+                a fresh LLM sample is required
+            **kwargs: Additional parameters, e.g. a precomputed ast_result
+                shared between agents
+
+        Yields:
+            {"type": "token", "text": ...} events while the LLM responds,
+            then a single {"type": "result", "result": ...} event holding the
+            same dictionary review() returns
+        """
+        cache_key = self._review_cache_key(code, language, kwargs)
+        cached = self._get_cached_review(cache_key) if cache else None
+        if cached is not None:
+            yield {"type": "result", "result": cached}
+            return
+
+        analysis_input, state = self._prepare_review(code, language, **kwargs)
+        if analysis_input is None:
+            yield {"type": "result", "result": self._skipped_review(state)}
+            return
+
+        chunks = []
+        async for text in self._astream(analysis_input, cache=cache):
+            chunks.append(text)
+            yield {"type": "token", "text": text}
+
+        result = self._finalize_review("".join(chunks), state)
+        self._cache_review(cache_key, result)
+        yield {"type": "result", "result": result}
+
+    def review_batch(
+        self, items: Sequence[Dict[str, Any]], max_concurrency: int = 10
+    ) -> List[Any]:
+        """
+        Review several pieces of code, sending the LLM requests concurrently.
+
+        Args:
+            items: One dict per file with "code", optional "language"
+                (default "python") and any additional review parameters
+            max_concurrency: Cap on simultaneous LLM requests
+
+        Returns:
+            One entry per item, in order: its review result, or the
+            exception raised for it (a failing item does not fail the batch)
+        """
+        results, pending, prompts = self._start_batch(items)
+        if prompts:
+            outputs = self.chain.batch(
+                prompts,
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+            self._finish_batch(results, pending, outputs)
+        return results
+
+    async def areview_batch(
+        self, items: Sequence[Dict[str, Any]], max_concurrency: int = 10
+    ) -> List[Any]:
+        """
+        Review several pieces of code without blocking the event loop.
+
+        Args:
+            items: One dict per file with "code", optional "language"
+                (default "python") and any additional review parameters
+            max_concurrency: Cap on simultaneous LLM requests
+
+        Returns:
+            One entry per item, in order: its review result, or the
+            exception raised for it (a failing item does not fail the batch)
+        """
+        results, pending, prompts = self._start_batch(items)
+        if prompts:
+            outputs = await self.chain.abatch(
+                prompts,
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+            self._finish_batch(results, pending, outputs)
+        return results
+
+    def _start_batch(
+        self, items: Sequence[Dict[str, Any]]
+    ) -> Tuple[List[Any], List[_PendingReview], List[Dict[str, str]]]:
+        """Resolve cached and skipped items and collect the remaining prompts."""
+        results: List[Any] = [None] * len(items)
+        pending = []
+        prompts = []
+
+        for index, item in enumerate(items):
+            params = dict(item)
+            code = params.pop("code")
+            language = params.pop("language", "python")
+            try:
+                cache_key = self._review_cache_key(code, language, params)
+                cached = self._get_cached_review(cache_key)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+
+                analysis_input, state = self._prepare_review(code, language, **params)
+                if analysis_input is None:
+                    results[index] = self._skipped_review(state)
+                    continue
+            except Exception as e:
+                results[index] = e
+                continue
+
+            pending.append((index, cache_key, state))
+            prompts.append({"input": analysis_input})
+
+        return results, pending, prompts
+
+    def _finish_batch(
+        self,
+        results: List[Any],
+        pending: List[_PendingReview],
+        outputs: List[Any],
+    ) -> None:
+        """Finalize the batched LLM outputs into their result slots."""
+        for (index, cache_key, state), output in zip(pending, outputs):
+            if isinstance(output, Exception):
+                error_msg = f"[{self.role}] Error processing request: {str(output)}"
+                error = RuntimeError(error_msg)
+                error.__cause__ = output
+                results[index] = error
+                continue
+
+            result = self._finalize_review(output, state)
+            self._cache_review(cache_key, result)
+            results[index] = result
+
+    def _code_for_prompt(self, code: str) -> str:
+        """
+        Return the code to embed in the LLM prompt, cut to the token budget.
+
+        Oversized code is cut at a line boundary so the kept lines keep their
+        line numbers; the local checks still see the full code.
+
+        Args:
+            code: The code to review
+
+        Returns:
+            The code, or its leading lines plus a truncation marker
+        """
+        max_chars = MAX_CODE_TOKENS * CHARS_PER_TOKEN
+        if len(code) <= max_chars:
+            return code
+
+        cut = code.rfind("\n", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        omitted = code.count("\n", cut) + (0 if code[cut] == "\n" else 1)
+        return f"{code[:cut]}\n[... {omitted} more lines truncated ...]"
+
+    def _review_cache_key(
+        self, code: str, language: str, params: Dict[str, Any]
+    ) -> str:
+        """Build the review cache key for this agent, language, code and options."""
+        options = sorted(
+            (name, repr(value))
+            for name, value in params.items()
+            if name not in _DERIVED_REVIEW_PARAMS
+        )
+        key = f"{self.role}\0{language}\0{options!r}\0{code}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _get_cached_review(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached review result, or None on a miss."""
+        with self._review_cache_lock:
+            result = self._review_cache.get(cache_key)
+            if result is None:
+                return None
+            self._review_cache.move_to_end(cache_key)
+
+        # Stored entries are never mutated, so the copy can run unlocked
+        return copy.deepcopy(result)
+
+    def _cache_review(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Store a copy of a review result, evicting the least recently used entry."""
+        result = copy.deepcopy(result)
+        with self._review_cache_lock:
+            self._review_cache[cache_key] = result
+            if len(self._review_cache) > REVIEW_CACHE_SIZE:
+                self._review_cache.popitem(last=False)
+
+    @abstractmethod
+    def _prepare_review(
+        self, code: str, language: str, **kwargs
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Run the local checks and build the LLM prompt.
+
+        Must be implemented by subclasses.
+
+        Args:
+            code: The code to review
+            language: Programming language
             **kwargs: Additional parameters
 
+        Returns:
+            Tuple of the prompt text and the state needed by _finalize_review.
+            The prompt is None when the local checks already settle the
+            review, in which case _skipped_review builds the result.
+        """
+        pass
+
+    @abstractmethod
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Combine the LLM analysis with the local checks into review results.
+
+        Must be implemented by subclasses.
+
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
+
         Returns:
             Dictionary with review results and findings
         """
         pass
 
+    def _skipped_review(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build review results without an LLM call.
+
+        Only needed by agents whose _prepare_review can return no prompt.
+
+        Args:
+            state: State returned by _prepare_review
+
+        Returns:
+            Dictionary with review results and findings
+        """
+        raise NotImplementedError(f"{type(self).__name__} never skips the LLM")
+
     def get_role(self) -> str:
         """Get the agent's role."""
         return self.role
+
+
+async def run_all_parallel(
+    code: str,
+    language: str,
+    agents: Sequence[BaseCodeReviewAgent],
+    max_concurrency: Optional[int] = None,
+    **kwargs,
+) -> List[Any]:
+    """
+    Run several agents' reviews concurrently.
+
+    Args:
+        code: The code to review
+        language: Programming language
+        agents: Agents to run
+        max_concurrency: Optional cap on simultaneous LLM requests
+        **kwargs: Additional parameters passed to each agent
+
+    Returns:
+        One entry per agent, in order: its review result, or the exception
+        it raised (a failing agent does not cancel the others)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _run(agent: BaseCodeReviewAgent) -> Dict[str, Any]:
+        if semaphore is None:
+            return await agent.areview(code, language, **kwargs)
+        async with semaphore:
+            return await agent.areview(code, language, **kwargs)
+
+    return await asyncio.gather(
+        *(_run(agent) for agent in agents), return_exceptions=True
+    )
@@ -4,11 +4,30 @@ Best Practices Agent for Code Review.
 Reviews code against language-specific best practices, design patterns, and architectural principles.
 """
 
-from typing import Any, Dict, List
+import ast
+import re
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..tools.ast_analyzer import ASTAnalyzer
 from .base_agent import BaseCodeReviewAgent
 
+# Highest cyclomatic complexity for which a clean scan skips the LLM
+SKIP_LLM_MAX_COMPLEXITY = 10
+
+# Shortest function body (in statements) checked for duplication
+MIN_DUPLICATE_BODY_STATEMENTS = 3
+
+_MAGIC_NUMS_RE = re.compile(r"\b\d+\b")
+_LINE_NUM_RE = re.compile(r"line\s+(\d+)")
+_BP_KEYWORDS_RE = re.compile(
+    r"anti-pattern|violation|principle|best practice|design|architecture|solid|dry"
+)
+
+# Score deducted per issue by severity; any other severity costs 0.5
+_SEVERITY_PENALTY = {"high": 2.0, "medium": 1.0}
+
 
 class BestPracticesAgent(BaseCodeReviewAgent):
     """
@@ -23,6 +42,9 @@ class BestPracticesAgent(BaseCodeReviewAgent):
     - Code organization
     """
 
+    # ASTAnalyzer is stateless, so all instances share one
+    ast_analyzer = ASTAnalyzer()
+
     def __init__(
         self, model_name: str = None, temperature: float = 0.3, api_key: str = None
     ):
@@ -34,17 +56,16 @@ class BestPracticesAgent(BaseCodeReviewAgent):
             temperature: LLM temperature
             api_key: Gemini API key
         """
-        system_prompt = """You are a software architecture and best practices expert. Your role is to:
-1. Review code against language-specific best practices
-2. Identify design patterns and anti-patterns
-3. Check SOLID principles adherence
-4. Detect DRY (Don't Repeat Yourself) violations
-5. Review code organization and structure
-6. Identify architectural issues
-7. Suggest improvements based on best practices
-
-Focus on maintainability, scalability, and code quality principles.
-Provide actionable recommendations for improvement."""
+        system_prompt = """You are a software architecture and best practices expert. Review the code for:
+1. Design patterns and anti-patterns
+2. SOLID principles (Single Responsibility, Open/Closed, Liskov Substitution, Interface Segregation, Dependency Inversion)
+3. DRY violations (code duplication)
+4. Code organization, modularity and separation of concerns
+5. Error handling and resource management
+6. Architectural issues
+
+For each issue give: type and category, the violation, location (line number if possible), why it matters, and a suggested improvement.
+Keep the response concise, with recommendations in priority order."""
 
         super().__init__(
             role="Best Practices Reviewer",
@@ -54,61 +75,86 @@ Provide actionable recommendations for improvement."""
             api_key=api_key,
         )
 
-        self.ast_analyzer = ASTAnalyzer()
-
-    def review(self, code: str, language: str = "python", **kwargs) -> Dict[str, Any]:
+    def _prepare_review(
+        self,
+        code: str,
+        language: str,
+        ast_result: Optional[Dict[str, Any]] = None,
+        lines: Optional[List[str]] = None,
+        force_llm: bool = False,
+        **kwargs,
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
         """
-        Review code for best practices violations.
+        Scan for anti-patterns and build the best practices analysis prompt.
 
         Args:
             code: Source code to review
             language: Programming language
+            ast_result: ASTAnalyzer.parse result shared by the caller
+                (parsed here when not provided)
+            lines: code.split("\n") shared by the caller
+                (split here when not provided)
+            force_llm: Ask the LLM even when the structural scan is clean
             **kwargs: Additional parameters
 
         Returns:
-            Dictionary with best practices analysis results
+            Tuple of the prompt text (None when the LLM can be skipped)
+            and the review state
         """
         # Analyze code structure
-        ast_result = {}
-        if language.lower() == "python":
+        if language.lower() != "python":
+            ast_result = {}
+        elif ast_result is None:
             ast_result = self.ast_analyzer.parse(code, language)
 
         # Identify anti-patterns
-        anti_patterns = self._identify_anti_patterns(code, language, ast_result)
+        if lines is None:
+            lines = code.split("\n")
+        anti_patterns = self._identify_anti_patterns(lines, language, ast_result)
+
+        state = {"language": language, "anti_patterns": anti_patterns}
+
+        # Simple code with no detected anti-patterns needs no LLM review
+        if (
+            not force_llm
+            and not anti_patterns
+            and ast_result.get("valid")
+            and ast_result.get("complexity", {}).get("cyclomatic", 0)
+            <= SKIP_LLM_MAX_COMPLEXITY
+        ):
+            return None, state
 
         # Prepare best practices analysis prompt
+        prompt_code = self._code_for_prompt(code)
         analysis_input = f"""Code to review for best practices ({language}):
 
 ```{language}
-{code}
+{prompt_code}
 ```
 
 Code Structure:
 {self._format_structure_info(ast_result)}
 
 Detected Patterns:
-{self._format_anti_patterns(anti_patterns)}
+{self._format_anti_patterns(anti_patterns)}"""
 
-Review this code against best practices. Check for:
-1. Design patterns and anti-patterns
-2. SOLID principles (Single Responsibility, Open/Closed, Liskov Substitution, Interface Segregation, Dependency Inversion)
-3. DRY violations (code duplication)
-4. Code organization and modularity
-5. Separation of concerns
-6. Error handling best practices
-7. Resource management
-8. Architectural issues
+        return analysis_input, state
 
-For each issue found, provide:
-- Issue type and category
-- Description of the best practice violation
-- Location (line number if possible)
-- Explanation of why it's an issue
-- Suggested improvement following best practices
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build best practices analysis results from the LLM analysis.
 
-Format your response clearly with prioritized recommendations."""
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
 
-        analysis_result = self._invoke(analysis_input)
+        Returns:
+            Dictionary with best practices analysis results
+        """
+        language = state["language"]
+        anti_patterns = state["anti_patterns"]
 
         # Extract best practices issues
         issues = self._extract_best_practices_issues(analysis_result, anti_patterns)
@@ -127,28 +173,40 @@ Format your response clearly with prioritized recommendations."""
             "severity": "high" if issues else "none",
         }
 
+    def _skipped_review(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build best practices results for code the structural scan found clean.
+
+        Args:
+            state: State returned by _prepare_review
+
+        Returns:
+            Dictionary with best practices analysis results
+        """
+        return {
+            "agent": self.role,
+            "language": state["language"],
+            "issues": [],
+            "issue_count": 0,
+            "anti_patterns": [],
+            "best_practices_score": 10.0,
+            "analysis": (
+                "No best practices issues detected by structural scan; "
+                "LLM review skipped."
+            ),
+            "severity": "none",
+            "skipped_llm": True,
+        }
+
     def _identify_anti_patterns(
-        self, code: str, language: str, ast_result: Dict[str, Any]
+        self, lines: List[str], language: str, ast_result: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Identify common anti-patterns."""
         anti_patterns = []
-        lines = code.split("\n")
 
-        # Check for code duplication (simple check)
-        function_bodies = {}
-        if ast_result.get("valid"):
-            functions = ast_result.get("functions", [])
-            for func in functions:
-                func_name = func.get("name", "")
-                # Simple duplication check - look for repeated function patterns
-                if func_name in function_bodies:
-                    anti_patterns.append(
-                        {
-                            "type": "potential_duplication",
-                            "message": f"Potential code duplication in function '{func_name}'",
-                            "category": "DRY violation",
-                        }
-                    )
+        # Check for code duplication: functions with identical bodies
+        if ast_result.get("valid") and ast_result.get("ast_tree"):
+            anti_patterns.extend(self._find_duplicate_functions(ast_result["ast_tree"]))
 
         # Check for god class/function (too many responsibilities)
         if ast_result.get("valid"):
@@ -163,12 +221,14 @@ Format your response clearly with prioritized recommendations."""
                 )
 
         # Check for magic numbers
-        import re
-
         for i, line in enumerate(lines, 1):
-            # Look for standalone numbers (potential magic numbers)
-            numbers = re.findall(r"\b\d+\b", line)
-            if len(numbers) > 2 and "=" in line:
+            # Only assignments/comparisons are candidates; skip the rest cheaply
+            if "=" not in line:
+                continue
+
+            # Look for standalone numbers, stopping once three are found
+            numbers = islice(_MAGIC_NUMS_RE.finditer(line), 3)
+            if sum(1 for _ in numbers) == 3:
                 anti_patterns.append(
                     {
                         "type": "magic_numbers",
@@ -180,6 +240,38 @@ Format your response clearly with prioritized recommendations."""
 
         return anti_patterns
 
+    def _find_duplicate_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
+        """Flag functions whose bodies are identical (ignoring docstrings)."""
+        bodies = defaultdict(list)
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+
+            body = node.body
+            if ast.get_docstring(node) is not None:
+                body = body[1:]
+            # Tiny bodies (getters, stubs) repeat legitimately
+            if len(body) < MIN_DUPLICATE_BODY_STATEMENTS:
+                continue
+
+            key = ast.dump(ast.Module(body=body, type_ignores=[]))
+            bodies[key].append(node)
+
+        duplicates = []
+        for nodes in bodies.values():
+            if len(nodes) > 1:
+                names = ", ".join(f"'{node.name}'" for node in nodes)
+                duplicates.append(
+                    {
+                        "type": "potential_duplication",
+                        "line": nodes[1].lineno,
+                        "message": f"Functions {names} have identical bodies",
+                        "category": "DRY violation",
+                    }
+                )
+
+        return duplicates
+
     def _format_structure_info(self, ast_result: Dict[str, Any]) -> str:
         """Format structure information for the prompt."""
         if not ast_result or not ast_result.get("valid"):
@@ -228,54 +320,43 @@ Format your response clearly with prioritized recommendations."""
         # Parse LLM response
         lines = analysis_text.split("\n")
         current_issue = None
+        message_parts: List[str] = []
 
         for line in lines:
             line_lower = line.lower()
 
             # Detect best practices issue markers
-            if any(
-                keyword in line_lower
-                for keyword in [
-                    "anti-pattern",
-                    "violation",
-                    "principle",
-                    "best practice",
-                    "design",
-                    "architecture",
-                    "solid",
-                    "dry",
-                ]
-            ):
+            keywords = _BP_KEYWORDS_RE.findall(line_lower)
+            if keywords:
                 if current_issue:
+                    current_issue["message"] = " ".join(message_parts)
                     issues.append(current_issue)
 
+                # The same scan tells us which principle the issue is about
+                category = "best_practices"
+                if "solid" in keywords:
+                    category = "SOLID principles"
+                elif "dry" in keywords:
+                    category = "DRY violation"
+
                 current_issue = {
                     "type": "best_practice_issue",
-                    "category": "best_practices",
+                    "category": category,
                     "message": line.strip(),
                     "severity": "medium",
                 }
+                message_parts = [line.strip()]
             elif current_issue:
-                # Try to extract line number or category
+                # Try to extract line number
                 if "line" in line_lower:
-                    try:
-                        import re
-
-                        line_match = re.search(r"line\s+(\d+)", line_lower)
-                        if line_match:
-                            current_issue["line"] = int(line_match.group(1))
-                    except Exception:
-                        pass
+                    line_match = _LINE_NUM_RE.search(line_lower)
+                    if line_match:
+                        current_issue["line"] = int(line_match.group(1))
 
-                # Detect category
-                if "solid" in line_lower:
-                    current_issue["category"] = "SOLID principles"
-                elif "dry" in line_lower:
-                    current_issue["category"] = "DRY violation"
-
-                current_issue["message"] += " " + line.strip()
+                message_parts.append(line.strip())
 
         if current_issue:
+            current_issue["message"] = " ".join(message_parts)
             issues.append(current_issue)
 
         return issues
@@ -285,14 +366,9 @@ Format your response clearly with prioritized recommendations."""
         if not issues:
             return 10.0
 
-        score = 10.0
-        for issue in issues:
-            severity = issue.get("severity", "medium")
-            if severity == "high":
-                score -= 2.0
-            elif severity == "medium":
-                score -= 1.0
-            else:
-                score -= 0.5
+        score = 10.0 - sum(
+            _SEVERITY_PENALTY.get(issue.get("severity", "medium"), 0.5)
+            for issue in issues
+        )
 
         return max(0.0, score)
@@ -0,0 +1,332 @@
+"""
+Combined Review Agent for Code Review.
+
+Runs several reviews (by default performance, security and style) in a single
+LLM call, so the code is sent once instead of once per review.
+"""
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from ..tools.ast_analyzer import ASTAnalyzer
+from .base_agent import BaseCodeReviewAgent
+from .best_practices_agent import BestPracticesAgent
+from .documentation_agent import DocumentationAgent
+from .performance_agent import PerformanceAgent
+from .security_agent import SecurityAgent
+from .style_agent import StyleAgent
+from .syntax_analyzer import SyntaxAnalyzerAgent
+
+# Default sections of the combined response, in prompt order
+SECTIONS = ("performance", "security", "style")
+
+# Every section the combined agent can review, in prompt order
+ALL_SECTIONS = (
+    "syntax",
+    "security",
+    "performance",
+    "style",
+    "best_practices",
+    "documentation",
+)
+
+_SECTION_AGENTS = {
+    "syntax": SyntaxAnalyzerAgent,
+    "security": SecurityAgent,
+    "performance": PerformanceAgent,
+    "style": StyleAgent,
+    "best_practices": BestPracticesAgent,
+    "documentation": DocumentationAgent,
+}
+
+# What each section reviews, and the label its issues start with
+_SECTION_FOCUS = {
+    "syntax": (
+        "Syntax",
+        "syntax errors, runtime errors, undefined names, type issues, logic errors",
+    ),
+    "security": (
+        "Security",
+        "injection, XSS, hardcoded secrets, authentication/authorization flaws, "
+        "input validation, insecure data handling (use OWASP Top 10 as a "
+        "reference)",
+    ),
+    "performance": (
+        "Performance",
+        "time complexity, memory use, bottlenecks, inefficient algorithms or "
+        "data structures, resource leaks, caching opportunities",
+    ),
+    "style": (
+        "Style",
+        "naming conventions, formatting, indentation, line length, consistency "
+        "with the language's style guide",
+    ),
+    "best_practices": (
+        "Best practice",
+        "design principles (SOLID, DRY), anti-patterns, error handling, "
+        "maintainability",
+    ),
+    "documentation": (
+        "Documentation",
+        "missing or unclear docstrings and comments, documentation coverage",
+    ),
+}
+
+
+class CombinedReviewAgent(BaseCodeReviewAgent):
+    """
+    Agent that fuses several reviews into one LLM call.
+
+    The local pre-scans and result building are delegated to the individual
+    agents; only the LLM call is shared. The result holds one entry per
+    section with the same shape the individual agent's review() returns.
+    """
+
+    # ASTAnalyzer is stateless, so all instances share one
+    ast_analyzer = ASTAnalyzer()
+
+    def __init__(
+        self,
+        model_name: str = None,
+        temperature: float = 0.2,
+        api_key: str = None,
+        agents: Optional[Dict[str, BaseCodeReviewAgent]] = None,
+    ):
+        """
+        Initialize the Combined Review Agent.
+
+        Args:
+            model_name: Gemini model name
+            temperature: LLM temperature
+            api_key: Gemini API key
+            agents: Optional section name -> agent mapping to delegate to
+                (keys from ALL_SECTIONS); defaults to new performance,
+                security and style agents
+        """
+        if agents is None:
+            agent_kwargs = {
+                "model_name": model_name,
+                "temperature": temperature,
+                "api_key": api_key,
+            }
+            agents = {
+                section: _SECTION_AGENTS[section](**agent_kwargs)
+                for section in SECTIONS
+            }
+
+        unknown = set(agents) - set(ALL_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown review sections: {sorted(unknown)}")
+
+        self.sections = tuple(section for section in ALL_SECTIONS if section in agents)
+        self.agents = dict(agents)
+
+        focus = "\n".join(
+            f"- {section}: {_SECTION_FOCUS[section][1]}" for section in self.sections
+        )
+        keys = ", ".join(f'"{section}"' for section in self.sections)
+        label = _SECTION_FOCUS[self.sections[0]][0]
+        system_prompt = f"""You are a code reviewer covering several review areas. Review the code for:
+{focus}
+
+Respond with only a JSON object with the keys {keys}.
+Each value is a string listing that section's issues, one per line, starting with the section name (e.g. "{label} issue (high): ..."), with its severity (critical/high/medium/low), description, location (line number if possible) and recommended fix."""
+
+        super().__init__(
+            role="Combined Reviewer",
+            system_prompt=system_prompt,
+            model_name=model_name,
+            temperature=temperature,
+            api_key=api_key,
+        )
+
+    def _prepare_review(
+        self, code: str, language: str, **kwargs
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Run every section's pre-scan and build the combined prompt.
+
+        Args:
+            code: Source code to review
+            language: Programming language
+            **kwargs: Additional parameters passed to each section's agent
+
+        Returns:
+            Tuple of the prompt text (None when every section can skip the
+            LLM) and the review state
+        """
+        # Parse and split once for all pre-scans
+        if kwargs.get("ast_result") is None and language.lower() == "python":
+            kwargs["ast_result"] = self.ast_analyzer.parse(code, language)
+        if kwargs.get("lines") is None:
+            kwargs["lines"] = code.split("\n")
+
+        states = {}
+        asked = []
+        for section in self.sections:
+            section_input, states[section] = self.agents[section]._prepare_review(
+                code, language, **kwargs
+            )
+            # Sections whose pre-scan found nothing to ask about stay out of
+            # the prompt
+            if section_input is not None:
+                asked.append(section)
+
+        state = {"language": language, "states": states, "asked": asked}
+        if not asked:
+            return None, state
+
+        context = "\n\n".join(
+            f"[{section}]\n{self._format_section_context(section, states[section], kwargs)}"
+            for section in asked
+        )
+        keys = ", ".join(f'"{section}"' for section in asked)
+
+        prompt_code = self._code_for_prompt(code)
+        analysis_input = f"""Code to review ({language}):
+
+```{language}
+{prompt_code}
+```
+
+{context}
+
+Respond with the keys {keys}."""
+
+        return analysis_input, state
+
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Split the combined response and build each section's results.
+
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
+
+        Returns:
+            Dictionary with the results of every section
+        """
+        asked = state["asked"]
+        sections = self._parse_sections(analysis_result, asked)
+
+        results = {}
+        for section in self.sections:
+            agent = self.agents[section]
+            section_state = state["states"][section]
+            if section not in asked:
+                results[section] = agent._skipped_review(section_state)
+                continue
+
+            # Without a parseable JSON reply, each section parses the full text
+            section_text = analysis_result if sections is None else sections[section]
+            results[section] = agent._finalize_review(section_text, section_state)
+
+        return self._combine_results(
+            state["language"], results, analysis_result, sections is not None
+        )
+
+    def _skipped_review(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build combined results when no section needs the LLM.
+
+        Args:
+            state: State returned by _prepare_review
+
+        Returns:
+            Dictionary with the results of every section
+        """
+        results = {
+            section: self.agents[section]._skipped_review(state["states"][section])
+            for section in self.sections
+        }
+        return self._combine_results(state["language"], results, "", True)
+
+    def _combine_results(
+        self,
+        language: str,
+        results: Dict[str, Dict[str, Any]],
+        analysis_result: str,
+        sections_parsed: bool,
+    ) -> Dict[str, Any]:
+        """Build the combined result around the per-section results."""
+        return {
+            "agent": self.role,
+            "language": language,
+            "results": results,
+            "issue_count": sum(
+                result.get("issue_count", result.get("vulnerability_count", 0))
+                for result in results.values()
+            ),
+            "analysis": analysis_result,
+            "sections_parsed": sections_parsed,
+        }
+
+    def _format_section_context(
+        self, section: str, state: Dict[str, Any], kwargs: Dict[str, Any]
+    ) -> str:
+        """Format a section's pre-scan findings for the prompt."""
+        agent = self.agents[section]
+
+        if section == "syntax":
+            return f"""AST Analysis Results:
+{agent._format_ast_results(state["ast_result"])}"""
+
+        if section == "security":
+            return f"""Detected Security Patterns:
+{agent._format_pattern_matches(state["pattern_matches"])}"""
+
+        if section == "performance":
+            return f"""Code Complexity Metrics:
+{agent._format_complexity_metrics(state["complexity_metrics"])}
+
+Detected Performance Patterns:
+{agent._format_performance_issues(state["performance_issues"])}"""
+
+        if section == "style":
+            return f"""Style Guide: {state["style_guide"]}
+
+Detected Style Patterns:
+{agent._format_style_issues(state["style_issues"])}"""
+
+        if section == "best_practices":
+            return f"""Code Structure:
+{agent._format_structure_info(kwargs.get("ast_result") or {})}
+
+Detected Patterns:
+{agent._format_anti_patterns(state["anti_patterns"])}"""
+
+        return f"""Documentation Statistics:
+{agent._format_docstring_stats(state["docstring_stats"])}
+
+Detected Documentation Issues:
+{agent._format_doc_issues(state["doc_issues"])}"""
+
+    def _parse_sections(
+        self, analysis_text: str, sections: Sequence[str]
+    ) -> Optional[Dict[str, str]]:
+        """Parse the JSON response into section texts, or None if malformed."""
+        text = analysis_text.strip()
+
+        # Models often wrap JSON in a markdown code fence
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1]
+            text = text.rsplit("```", 1)[0]
+
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+
+        if not isinstance(data, dict):
+            return None
+
+        texts = {}
+        for section in sections:
+            value = data.get(section, "")
+            if isinstance(value, list):
+                value = "\n".join(str(item) for item in value)
+            texts[section] = str(value)
+
+        return texts
@@ -4,11 +4,62 @@ Documentation Agent for Code Review.
 Reviews code documentation quality, docstrings, comments, and README files.
 """
 
-from typing import Any, Dict, List
+import ast
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..tools.ast_analyzer import ASTAnalyzer
 from .base_agent import BaseCodeReviewAgent
 
+_LINE_NUM_RE = re.compile(r"line\s+(\d+)")
+_DOC_KEYWORDS_RE = re.compile(r"docstring|documentation|comment|missing|unclear")
+
+# Score deducted per issue by severity; any other severity costs 0.5
+_SEVERITY_PENALTY = {"high": 2.0, "medium": 1.0}
+
+# Definitions only ever appear as statements, so the docstring walk never
+# needs to descend into expressions
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if hasattr(ast, "match_case") else ()
+)
+
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _count_docstrings(tree: ast.AST) -> Tuple[int, int, int, int]:
+    """
+    Count documented and undocumented functions and classes.
+
+    Returns:
+        Tuple of (functions with docstrings, functions without,
+        classes with docstrings, classes without)
+    """
+    fwd = fwod = cwd = cwod = 0
+
+    # Only follow statements: nested defs are still counted, but expression
+    # subtrees are skipped entirely
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _FUNCTION_NODES):
+            if ast.get_docstring(node):
+                fwd += 1
+            else:
+                fwod += 1
+        elif isinstance(node, ast.ClassDef):
+            if ast.get_docstring(node):
+                cwd += 1
+            else:
+                cwod += 1
+        stack.extend(
+            child
+            for child in ast.iter_child_nodes(node)
+            if isinstance(child, _STATEMENT_NODES)
+        )
+
+    return fwd, fwod, cwd, cwod
+
 
 class DocumentationAgent(BaseCodeReviewAgent):
     """
@@ -22,6 +73,9 @@ class DocumentationAgent(BaseCodeReviewAgent):
     - Code clarity and self-documentation
     """
 
+    # ASTAnalyzer is stateless, so all instances share one
+    ast_analyzer = ASTAnalyzer()
+
     def __init__(
         self, model_name: str = None, temperature: float = 0.3, api_key: str = None
     ):
@@ -33,20 +87,15 @@ class DocumentationAgent(BaseCodeReviewAgent):
             temperature: LLM temperature
             api_key: Gemini API key
         """
-        system_prompt = """You are a documentation quality reviewer. Your role is to:
-1. Review function and class docstrings
-2. Check comment quality and relevance
-3. Identify missing documentation
-4. Review code clarity (self-documenting code)
-5. Check documentation consistency
-6. Suggest documentation improvements
-
-Focus on:
-- Completeness of documentation
-- Clarity and usefulness of docstrings
-- Appropriate level of commenting
-- Self-documenting code practices
-- Documentation standards (Google style, NumPy style, etc.)"""
+        system_prompt = """You are a documentation quality reviewer. Review the code for:
+1. Missing function/class docstrings
+2. Docstring quality and completeness
+3. Inline comment quality and relevance
+4. Code clarity (self-documenting code)
+5. Consistency and adherence to a standard (Google, NumPy, etc.)
+
+For each issue give: type and severity, the problem, location (function/class name or line number), and a suggested improvement.
+Keep the response concise and actionable."""
 
         super().__init__(
             role="Documentation Reviewer",
@@ -56,64 +105,95 @@ Focus on:
             api_key=api_key,
         )
 
-        self.ast_analyzer = ASTAnalyzer()
-
-    def review(self, code: str, language: str = "python", **kwargs) -> Dict[str, Any]:
+    def _prepare_review(
+        self,
+        code: str,
+        language: str,
+        ast_result: Optional[Dict[str, Any]] = None,
+        lines: Optional[List[str]] = None,
+        force_llm: bool = False,
+        **kwargs,
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
         """
-        Review code for documentation quality.
+        Measure docstring coverage and build the documentation analysis prompt.
 
         Args:
             code: Source code to review
             language: Programming language
+            ast_result: ASTAnalyzer.parse result shared by the caller
+                (parsed here when not provided)
+            lines: code.split("\n") shared by the caller
+                (split here when not provided)
+            force_llm: Ask the LLM even when the structural scan is clean
             **kwargs: Additional parameters
 
         Returns:
-            Dictionary with documentation analysis results
+            Tuple of the prompt text (None when the LLM can be skipped)
+            and the review state
         """
         # Analyze code structure
-        ast_result = {}
-        docstring_stats = {}
-
-        if language.lower() == "python":
+        if language.lower() != "python":
+            ast_result = {}
+        elif ast_result is None:
             ast_result = self.ast_analyzer.parse(code, language)
-            if ast_result.get("valid"):
-                docstring_stats = self._analyze_docstrings(ast_result, code)
+
+        docstring_stats = {}
+        if ast_result.get("valid"):
+            docstring_stats = self._analyze_docstrings(ast_result, code)
 
         # Check documentation patterns
-        doc_issues = self._check_documentation_patterns(code, language, docstring_stats)
+        if lines is None:
+            lines = code.split("\n")
+        doc_issues = self._check_documentation_patterns(
+            lines, language, docstring_stats
+        )
+
+        state = {
+            "language": language,
+            "doc_issues": doc_issues,
+            "docstring_stats": docstring_stats,
+        }
+
+        # Fully documented code with no detected issues needs no LLM review
+        if (
+            not force_llm
+            and not doc_issues
+            and docstring_stats.get("coverage_percentage", 0) >= 100.0
+        ):
+            return None, state
 
         # Prepare documentation analysis prompt
+        prompt_code = self._code_for_prompt(code)
         analysis_input = f"""Code to review for documentation quality ({language}):
 
 ```{language}
-{code}
+{prompt_code}
 ```
 
 Documentation Statistics:
 {self._format_docstring_stats(docstring_stats)}
 
 Detected Documentation Issues:
-{self._format_doc_issues(doc_issues)}
+{self._format_doc_issues(doc_issues)}"""
 
-Review this code for documentation quality. Check for:
-1. Missing function/class docstrings
-2. Quality and completeness of existing docstrings
-3. Inline comment quality and relevance
-4. Code clarity and self-documentation
-5. Documentation consistency
-6. Appropriate level of documentation
-7. Documentation standards adherence
+        return analysis_input, state
 
-For each issue found, provide:
-- Issue type and severity
-- Description of the documentation problem
-- Location (function/class name or line number)
-- Suggested improvement
-- Documentation standard reference if applicable
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build documentation analysis results from the LLM analysis.
 
-Format your response clearly with actionable documentation improvements."""
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
 
-        analysis_result = self._invoke(analysis_input)
+        Returns:
+            Dictionary with documentation analysis results
+        """
+        language = state["language"]
+        doc_issues = state["doc_issues"]
+        docstring_stats = state["docstring_stats"]
 
         # Extract documentation issues
         issues = self._extract_documentation_issues(analysis_result, doc_issues)
@@ -132,12 +212,35 @@ Format your response clearly with actionable documentation improvements."""
             "severity": "medium" if issues else "none",
         }
 
+    def _skipped_review(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build documentation results for code the structural scan found clean.
+
+        Args:
+            state: State returned by _prepare_review
+
+        Returns:
+            Dictionary with documentation analysis results
+        """
+        return {
+            "agent": self.role,
+            "language": state["language"],
+            "issues": [],
+            "issue_count": 0,
+            "docstring_stats": state["docstring_stats"],
+            "documentation_score": 10.0,
+            "analysis": (
+                "No documentation issues detected by structural scan; "
+                "LLM review skipped."
+            ),
+            "severity": "none",
+            "skipped_llm": True,
+        }
+
     def _analyze_docstrings(
         self, ast_result: Dict[str, Any], code: str
     ) -> Dict[str, Any]:
         """Analyze docstring coverage and quality."""
-        import ast as ast_module
-
         stats = {
             "functions_with_docstrings": 0,
             "functions_without_docstrings": 0,
@@ -155,27 +258,20 @@ Format your response clearly with actionable documentation improvements."""
             if not tree:
                 return stats
 
-            # Count functions
-            for node in ast_module.walk(tree):
-                if isinstance(node, ast_module.FunctionDef):
-                    stats["total_functions"] += 1
-                    if ast_module.get_docstring(node):
-                        stats["functions_with_docstrings"] += 1
-                    else:
-                        stats["functions_without_docstrings"] += 1
-
-                elif isinstance(node, ast_module.ClassDef):
-                    stats["total_classes"] += 1
-                    if ast_module.get_docstring(node):
-                        stats["classes_with_docstrings"] += 1
-                    else:
-                        stats["classes_without_docstrings"] += 1
+            # Count functions (sync and async) and classes
+            fwd, fwod, cwd, cwod = _count_docstrings(tree)
+            stats = {
+                "functions_with_docstrings": fwd,
+                "functions_without_docstrings": fwod,
+                "classes_with_docstrings": cwd,
+                "classes_without_docstrings": cwod,
+                "total_functions": fwd + fwod,
+                "total_classes": cwd + cwod,
+            }
 
             # Calculate coverage
-            total_documented = (
-                stats["functions_with_docstrings"] + stats["classes_with_docstrings"]
-            )
-            total_items = stats["total_functions"] + stats["total_classes"]
+            total_documented = fwd + cwd
+            total_items = fwd + fwod + cwd + cwod
 
             if total_items > 0:
                 stats["coverage_percentage"] = (total_documented / total_items) * 100
@@ -189,7 +285,7 @@ Format your response clearly with actionable documentation improvements."""
         return stats
 
     def _check_documentation_patterns(
-        self, code: str, language: str, docstring_stats: Dict[str, Any]
+        self, lines: List[str], language: str, docstring_stats: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Check for documentation issues."""
         issues = []
@@ -216,7 +312,6 @@ Format your response clearly with actionable documentation improvements."""
             )
 
         # Check for TODO/FIXME comments without context
-        lines = code.split("\n")
         for i, line in enumerate(lines, 1):
             line_lower = line.lower()
             if ("todo" in line_lower or "fixme" in line_lower) and len(
@@ -267,22 +362,15 @@ Documentation Coverage: {stats.get("coverage_percentage", 0):.1f}%"""
         # Parse LLM response
         lines = analysis_text.split("\n")
         current_issue = None
+        message_parts: List[str] = []
 
         for line in lines:
             line_lower = line.lower()
 
             # Detect documentation issue markers
-            if any(
-                keyword in line_lower
-                for keyword in [
-                    "docstring",
-                    "documentation",
-                    "comment",
-                    "missing",
-                    "unclear",
-                ]
-            ):
+            if _DOC_KEYWORDS_RE.search(line_lower):
                 if current_issue:
+                    current_issue["message"] = " ".join(message_parts)
                     issues.append(current_issue)
 
                 # Determine severity
@@ -298,24 +386,17 @@ Documentation Coverage: {stats.get("coverage_percentage", 0):.1f}%"""
                     "message": line.strip(),
                     "category": "documentation",
                 }
+                message_parts = [line.strip()]
             elif current_issue:
-                # Try to extract location
-                if (
-                    "line" in line_lower
-                    or "function" in line_lower
-                    or "class" in line_lower
-                ):
-                    try:
-                        import re
-
-                        line_match = re.search(r"line\s+(\d+)", line_lower)
-                        if line_match:
-                            current_issue["line"] = int(line_match.group(1))
-                    except Exception:
-                        pass
-                current_issue["message"] += " " + line.strip()
+                # Try to extract line number (the regex needs "line" anyway)
+                if "line" in line_lower:
+                    line_match = _LINE_NUM_RE.search(line_lower)
+                    if line_match:
+                        current_issue["line"] = int(line_match.group(1))
+                message_parts.append(line.strip())
 
         if current_issue:
+            current_issue["message"] = " ".join(message_parts)
             issues.append(current_issue)
 
         return issues
@@ -324,17 +405,11 @@ Documentation Coverage: {stats.get("coverage_percentage", 0):.1f}%"""
         self, issues: List[Dict[str, Any]], docstring_stats: Dict[str, Any]
     ) -> float:
         """Calculate documentation score (0-10, higher is better)."""
-        score = 10.0
-
         # Deduct points for issues
-        for issue in issues:
-            severity = issue.get("severity", "medium")
-            if severity == "high":
-                score -= 2.0
-            elif severity == "medium":
-                score -= 1.0
-            else:
-                score -= 0.5
+        score = 10.0 - sum(
+            _SEVERITY_PENALTY.get(issue.get("severity", "medium"), 0.5)
+            for issue in issues
+        )
 
         # Deduct points for low coverage
         coverage = docstring_stats.get("coverage_percentage", 100.0)
@@ -4,11 +4,72 @@ Performance Agent for Code Review.
 Analyzes code for performance bottlenecks, inefficiencies, and optimization opportunities.
 """
 
-from typing import Any, Dict, List
+import ast
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..tools.ast_analyzer import ASTAnalyzer
+from ._extract import extract_issues
 from .base_agent import BaseCodeReviewAgent
 
+# Membership tests and searches that scan a list
+_LINEAR_SEARCH_RE = re.compile(r"in \[|in list|\.find\(")
+_PERF_KEYWORDS_RE = re.compile(r"performance|bottleneck|slow|inefficient|optimization")
+
+# Score deducted per issue by impact; any other impact costs 0.5
+_IMPACT_PENALTY = {"high": 2.0, "medium": 1.0}
+
+# Loops at least this deep are reported as nested loops; from the next level
+# on the impact is high
+NESTED_LOOP_DEPTH = 2
+
+
+def _is_string_expr(node: ast.AST) -> bool:
+    """Whether an expression evidently builds a string."""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str)
+    if isinstance(node, ast.JoinedStr):
+        return True
+    if isinstance(node, ast.Call):
+        return isinstance(node.func, ast.Name) and node.func.id == "str"
+    if isinstance(node, ast.BinOp):
+        return _is_string_expr(node.left) or _is_string_expr(node.right)
+    return False
+
+
+class _LoopVisitor(ast.NodeVisitor):
+    """Track the deepest for/while nesting and string += inside loops."""
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.max_depth_line = None
+        self.concat_lines: List[int] = []
+
+    def _visit_loop(self, node: ast.AST) -> None:
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+            self.max_depth_line = node.lineno
+        self.generic_visit(node)
+        self.depth -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def _visit_scope(self, node: ast.AST) -> None:
+        # A nested function or class body does not run per loop iteration
+        depth, self.depth = self.depth, 0
+        self.generic_visit(node)
+        self.depth = depth
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_scope
+    visit_ClassDef = visit_Lambda = _visit_scope
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        if self.depth and isinstance(node.op, ast.Add) and _is_string_expr(node.value):
+            self.concat_lines.append(node.lineno)
+        self.generic_visit(node)
+
 
 class PerformanceAgent(BaseCodeReviewAgent):
     """
@@ -23,6 +84,9 @@ class PerformanceAgent(BaseCodeReviewAgent):
     - Optimization opportunities
     """
 
+    # ASTAnalyzer is stateless, so all instances share one
+    ast_analyzer = ASTAnalyzer()
+
     def __init__(
         self, model_name: str = None, temperature: float = 0.3, api_key: str = None
     ):
@@ -34,22 +98,17 @@ class PerformanceAgent(BaseCodeReviewAgent):
             temperature: LLM temperature
             api_key: Gemini API key
         """
-        system_prompt = """You are a performance optimization expert. Your role is to:
-1. Analyze time complexity (Big O notation)
-2. Identify memory inefficiencies
-3. Detect performance bottlenecks
-4. Find inefficient algorithms or data structures
-5. Identify resource leaks (file handles, connections)
-6. Suggest optimization opportunities
-7. Check for unnecessary computations or redundant operations
-
-Focus on actionable performance improvements. Consider:
-- Algorithm efficiency
-- Data structure choices
-- Loop optimizations
-- Caching opportunities
-- Database query optimization
-- I/O operations"""
+        system_prompt = """You are a performance optimization expert. Review the code for:
+1. Time complexity issues (nested loops, inefficient algorithms, Big O)
+2. Memory inefficiencies (large data structures, memory leaks)
+3. Bottlenecks (slow or blocking I/O, unoptimized database queries)
+4. Inefficient data structures or algorithms
+5. Resource leaks (unclosed files, connections)
+6. Unnecessary computations or redundant operations
+7. Opportunities for caching or memoization
+
+For each issue give: type and impact (high/medium/low), the problem, location (line number if possible), current complexity (if applicable), the suggested optimization and expected improvement.
+Keep the response actionable, with recommendations in priority order."""
 
         super().__init__(
             role="Performance Analyst",
@@ -59,68 +118,82 @@ Focus on actionable performance improvements. Consider:
             api_key=api_key,
         )
 
-        self.ast_analyzer = ASTAnalyzer()
-
-    def review(self, code: str, language: str = "python", **kwargs) -> Dict[str, Any]:
+    def _prepare_review(
+        self,
+        code: str,
+        language: str,
+        ast_result: Optional[Dict[str, Any]] = None,
+        lines: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Review code for performance issues.
+        Scan for performance patterns and build the performance analysis prompt.
 
         Args:
             code: Source code to review
             language: Programming language
+            ast_result: ASTAnalyzer.parse result shared by the caller
+                (parsed here when not provided)
+            lines: code.split("\n") shared by the caller
+                (split here when not provided)
             **kwargs: Additional parameters
 
         Returns:
-            Dictionary with performance analysis results
+            Tuple of the prompt text and the review state
         """
         # Analyze code structure
-        ast_result = {}
-        complexity_metrics = {}
-
-        if language.lower() == "python":
+        if language.lower() != "python":
+            ast_result = {}
+        elif ast_result is None:
             ast_result = self.ast_analyzer.parse(code, language)
-            if ast_result.get("valid"):
-                complexity_metrics = ast_result.get("complexity", {})
+
+        complexity_metrics = {}
+        if ast_result.get("valid"):
+            complexity_metrics = ast_result.get("complexity", {})
 
         # Identify performance patterns
+        if lines is None:
+            lines = code.split("\n")
         performance_issues = self._identify_performance_patterns(
-            code, language, complexity_metrics
+            lines, language, complexity_metrics, ast_result.get("ast_tree")
         )
 
         # Prepare performance analysis prompt
+        prompt_code = self._code_for_prompt(code)
         analysis_input = f"""Code to analyze for performance issues ({language}):
 
 ```{language}
-{code}
+{prompt_code}
 ```
 
 Code Complexity Metrics:
 {self._format_complexity_metrics(complexity_metrics)}
 
 Detected Performance Patterns:
-{self._format_performance_issues(performance_issues)}
+{self._format_performance_issues(performance_issues)}"""
 
-Analyze this code for performance problems. Check for:
-1. Time complexity issues (nested loops, inefficient algorithms)
-2. Memory inefficiencies (large data structures, memory leaks)
-3. Performance bottlenecks (slow operations, blocking calls)
-4. Inefficient data structures or algorithms
-5. Resource leaks (unclosed files, connections)
-6. Unnecessary computations or redundant operations
-7. Opportunities for caching or memoization
-8. Database query optimization needs
+        return analysis_input, {
+            "language": language,
+            "performance_issues": performance_issues,
+            "complexity_metrics": complexity_metrics,
+        }
 
-For each issue found, provide:
-- Issue type and impact level (high/medium/low)
-- Description of the performance problem
-- Location (line number if possible)
-- Current complexity (if applicable)
-- Suggested optimization
-- Expected improvement
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build performance analysis results from the LLM analysis.
 
-Format your response clearly with prioritized recommendations."""
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
 
-        analysis_result = self._invoke(analysis_input)
+        Returns:
+            Dictionary with performance analysis results
+        """
+        language = state["language"]
+        performance_issues = state["performance_issues"]
+        complexity_metrics = state["complexity_metrics"]
 
         # Extract performance issues
         issues = self._extract_performance_issues(analysis_result, performance_issues)
@@ -143,11 +216,37 @@ Format your response clearly with prioritized recommendations."""
         }
 
     def _identify_performance_patterns(
-        self, code: str, language: str, complexity_metrics: Dict[str, Any]
+        self,
+        lines: List[str],
+        language: str,
+        complexity_metrics: Dict[str, Any],
+        tree: Optional[ast.AST] = None,
     ) -> List[Dict[str, Any]]:
         """Identify common performance anti-patterns."""
         issues = []
-        lines = code.split("\n")
+
+        # With a syntax tree, loops are found structurally, so keywords in
+        # comments and strings no longer count
+        concat_lines = None
+        if tree is not None:
+            visitor = _LoopVisitor()
+            visitor.visit(tree)
+            concat_lines = visitor.concat_lines
+
+            if visitor.max_depth >= NESTED_LOOP_DEPTH:
+                issues.append(
+                    {
+                        "type": "nested_loops",
+                        "impact": (
+                            "high"
+                            if visitor.max_depth > NESTED_LOOP_DEPTH
+                            else "medium"
+                        ),
+                        "line": visitor.max_depth_line,
+                        "message": f"Loops nested {visitor.max_depth} deep",
+                        "suggestion": "Consider a lookup table or a better algorithm",
+                    }
+                )
 
         # Check for nested loops
         nesting_level = complexity_metrics.get("max_nesting", 0)
@@ -166,7 +265,7 @@ Format your response clearly with prioritized recommendations."""
             line_lower = line.lower()
 
             # Check for inefficient list operations
-            if any(pattern in line_lower for pattern in ["in [", "in list", ".find("]):
+            if _LINEAR_SEARCH_RE.search(line_lower):
                 if "for" in line_lower or "if" in line_lower:
                     issues.append(
                         {
@@ -178,20 +277,25 @@ Format your response clearly with prioritized recommendations."""
                         }
                     )
 
-            # Check for string concatenation in loops
-            if "+=" in line and "str" in line_lower:
-                issues.append(
-                    {
-                        "type": "string_concat",
-                        "impact": "low",
-                        "line": i,
-                        "message": "String concatenation in loop",
-                        "suggestion": "Consider using join() or list comprehension",
-                    }
-                )
+            # Without a syntax tree, guess string concatenation from the text
+            if concat_lines is None and "+=" in line and "str" in line_lower:
+                issues.append(self._string_concat_issue(i))
+
+        if concat_lines:
+            issues.extend(self._string_concat_issue(i) for i in concat_lines)
 
         return issues
 
+    def _string_concat_issue(self, line: int) -> Dict[str, Any]:
+        """Build the issue for a string concatenation in a loop."""
+        return {
+            "type": "string_concat",
+            "impact": "low",
+            "line": line,
+            "message": "String concatenation in loop",
+            "suggestion": "Consider using join() or list comprehension",
+        }
+
     def _format_complexity_metrics(self, metrics: Dict[str, Any]) -> str:
         """Format complexity metrics for the prompt."""
         if not metrics:
@@ -224,72 +328,38 @@ Class Count: {metrics.get("class_count", "N/A")}"""
         issues = pattern_issues.copy()
 
         # Parse LLM response
-        lines = analysis_text.split("\n")
-        current_issue = None
+        issues.extend(
+            extract_issues(
+                analysis_text, _PERF_KEYWORDS_RE, self._new_performance_issue
+            )
+        )
 
-        for line in lines:
-            line_lower = line.lower()
+        return issues
 
-            # Detect performance issue markers
-            if any(
-                keyword in line_lower
-                for keyword in [
-                    "performance",
-                    "bottleneck",
-                    "slow",
-                    "inefficient",
-                    "optimization",
-                ]
-            ):
-                if current_issue:
-                    issues.append(current_issue)
-
-                # Determine impact
-                impact = "medium"
-                if "high" in line_lower or "critical" in line_lower:
-                    impact = "high"
-                elif "low" in line_lower or "minor" in line_lower:
-                    impact = "low"
-
-                current_issue = {
-                    "type": "performance_issue",
-                    "impact": impact,
-                    "message": line.strip(),
-                    "category": "performance",
-                }
-            elif current_issue:
-                # Try to extract line number
-                if "line" in line_lower:
-                    try:
-                        import re
-
-                        line_match = re.search(r"line\s+(\d+)", line_lower)
-                        if line_match:
-                            current_issue["line"] = int(line_match.group(1))
-                    except Exception:
-                        pass
-                current_issue["message"] += " " + line.strip()
-
-        if current_issue:
-            issues.append(current_issue)
+    def _new_performance_issue(self, line: str, line_lower: str) -> Dict[str, Any]:
+        """Build a performance issue from its marker line."""
+        # Determine impact
+        impact = "medium"
+        if "high" in line_lower or "critical" in line_lower:
+            impact = "high"
+        elif "low" in line_lower or "minor" in line_lower:
+            impact = "low"
 
-        return issues
+        return {
+            "type": "performance_issue",
+            "impact": impact,
+            "message": line.strip(),
+            "category": "performance",
+        }
 
     def _calculate_performance_score(
         self, issues: List[Dict[str, Any]], complexity_metrics: Dict[str, Any]
     ) -> float:
         """Calculate performance score (0-10, higher is better)."""
-        score = 10.0
-
         # Deduct points for issues
-        for issue in issues:
-            impact = issue.get("impact", "medium")
-            if impact == "high":
-                score -= 2.0
-            elif impact == "medium":
-                score -= 1.0
-            else:
-                score -= 0.5
+        score = 10.0 - sum(
+            _IMPACT_PENALTY.get(issue.get("impact", "medium"), 0.5) for issue in issues
+        )
 
         # Deduct points for high complexity
         cyclomatic = complexity_metrics.get("cyclomatic", 1)
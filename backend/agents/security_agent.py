@@ -5,11 +5,20 @@ Identifies security vulnerabilities, risks, and insecure coding practices.
 Uses Guardrails pattern to ensure code safety.
 """
 
-from typing import Any, Dict, List
+import re
+from typing import Any, Dict, List, Tuple
 
-from ..tools.ast_analyzer import ASTAnalyzer
+from ._extract import extract_issues
 from .base_agent import BaseCodeReviewAgent
 
+_SECURITY_KEYWORDS_RE = re.compile(r"vulnerability|security|risk|insecure")
+
+# Lines reported per matched security pattern
+MAX_PATTERN_LINES = 5
+
+# Score deducted per vulnerability by severity; any other severity costs 0.5
+_SEVERITY_PENALTY = {"critical": 3.0, "high": 2.0, "medium": 1.0}
+
 
 class SecurityAgent(BaseCodeReviewAgent):
     """
@@ -35,17 +44,17 @@ class SecurityAgent(BaseCodeReviewAgent):
             temperature: LLM temperature (low for consistent security checks)
             api_key: Gemini API key
         """
-        system_prompt = """You are a security expert specializing in code security review. Your role is to:
-1. Identify security vulnerabilities (SQL injection, XSS, CSRF, etc.)
-2. Detect hardcoded secrets, API keys, or credentials
-3. Check for insecure dependencies or outdated packages
-4. Identify authentication and authorization flaws
-5. Find input validation and sanitization issues
-6. Detect insecure data handling (encryption, hashing)
-7. Identify security anti-patterns
-
-Be thorough and prioritize critical security issues. Use OWASP Top 10 as a reference. 
-Report issues with severity levels: critical, high, medium, low."""
+        system_prompt = """You are a security expert specializing in code security review. Review the code for:
+1. Injection flaws (SQL injection, command injection) and cross-site scripting (XSS)
+2. Hardcoded secrets, API keys, or credentials
+3. Authentication and authorization flaws
+4. Input validation and sanitization issues
+5. Insecure data handling (encryption, hashing)
+6. Insecure or outdated dependencies
+7. Security anti-patterns
+
+Use OWASP Top 10 as a reference and prioritize critical issues.
+For each issue give: type and severity (critical/high/medium/low), description, location (line number if possible), potential impact, and the recommended fix."""
 
         super().__init__(
             role="Security Analyst",
@@ -55,12 +64,14 @@ Report issues with severity levels: critical, high, medium, low."""
             api_key=api_key,
         )
 
-        self.ast_analyzer = ASTAnalyzer()
         self.security_patterns = self._load_security_patterns()
+        self._prepare_security_patterns()
 
-    def review(self, code: str, language: str = "python", **kwargs) -> Dict[str, Any]:
+    def _prepare_review(
+        self, code: str, language: str, **kwargs
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Review code for security vulnerabilities.
+        Scan for security patterns and build the security analysis prompt.
 
         Args:
             code: Source code to review
@@ -68,43 +79,42 @@ Report issues with severity levels: critical, high, medium, low."""
             **kwargs: Additional parameters
 
         Returns:
-            Dictionary with security analysis results
+            Tuple of the prompt text and the review state
         """
-        # Analyze code structure
-
         # Check for security patterns
         pattern_matches = self._check_security_patterns(code, language)
 
         # Prepare security analysis prompt
+        prompt_code = self._code_for_prompt(code)
         analysis_input = f"""Code to analyze for security vulnerabilities ({language}):
 
 ```{language}
-{code}
+{prompt_code}
 ```
 
 Detected Security Patterns:
-{self._format_pattern_matches(pattern_matches)}
+{self._format_pattern_matches(pattern_matches)}"""
 
-Analyze this code thoroughly for security vulnerabilities. Check for:
-1. SQL injection vulnerabilities
-2. Cross-site scripting (XSS) risks
-3. Hardcoded secrets, API keys, or credentials
-4. Insecure authentication/authorization
-5. Input validation issues
-6. Insecure data handling
-7. Dependency vulnerabilities
-8. Security anti-patterns
+        return analysis_input, {
+            "language": language,
+            "pattern_matches": pattern_matches,
+        }
 
-For each issue found, provide:
-- Issue type and severity (critical/high/medium/low)
-- Description of the vulnerability
-- Location (line number if possible)
-- Potential impact
-- Recommended fix
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build security analysis results from the LLM analysis.
 
-Format your response clearly with prioritized issues."""
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
 
-        analysis_result = self._invoke(analysis_input)
+        Returns:
+            Dictionary with security analysis results
+        """
+        language = state["language"]
+        pattern_matches = state["pattern_matches"]
 
         # Extract security issues
         vulnerabilities = self._extract_vulnerabilities(
@@ -159,32 +169,48 @@ Format your response clearly with prioritized issues."""
             "path_traversal": ["../", "..\\", "open(", "file(", "read("],
         }
 
+    def _prepare_security_patterns(self) -> None:
+        """Precompute the lowercased security_patterns in report order."""
+        # (type, pattern, lowercased pattern)
+        self._pattern_keys = [
+            (pattern_type, pattern, pattern.lower())
+            for pattern_type, type_patterns in self.security_patterns.items()
+            for pattern in type_patterns
+        ]
+
     def _check_security_patterns(
         self, code: str, language: str
     ) -> List[Dict[str, Any]]:
         """Check code for known security anti-patterns."""
-        matches = []
         code_lower = code.lower()
 
-        for pattern_type, patterns in self.security_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in code_lower:
-                    # Find line numbers
-                    lines = code.split("\n")
-                    matching_lines = [
-                        i + 1
-                        for i, line in enumerate(lines)
-                        if pattern.lower() in line.lower()
-                    ]
-
-                    matches.append(
-                        {
-                            "type": pattern_type,
-                            "pattern": pattern,
-                            "lines": matching_lines[:5],  # Limit to first 5 matches
-                            "severity": self._get_pattern_severity(pattern_type),
-                        }
-                    )
+        matches = []
+        for pattern_type, pattern, pattern_lower in self._pattern_keys:
+            # str.find scans in C; after a hit, resume at the next line and
+            # stop at the number of lines reported
+            matching_lines = []
+            line_no = 1
+            pos = 0
+            found = code_lower.find(pattern_lower)
+            while found != -1:
+                line_no += code_lower.count("\n", pos, found)
+                matching_lines.append(line_no)
+                if len(matching_lines) == MAX_PATTERN_LINES:
+                    break
+                pos = code_lower.find("\n", found)
+                if pos == -1:
+                    break
+                found = code_lower.find(pattern_lower, pos)
+
+            if matching_lines:
+                matches.append(
+                    {
+                        "type": pattern_type,
+                        "pattern": pattern,
+                        "lines": matching_lines,
+                        "severity": self._get_pattern_severity(pattern_type),
+                    }
+                )
 
         return matches
 
@@ -232,69 +258,41 @@ Format your response clearly with prioritized issues."""
                     }
                 )
 
-        # Parse LLM response for additional vulnerabilities
-        lines = analysis_text.split("\n")
-        current_vuln = None
-
-        for line in lines:
-            line_lower = line.lower()
-
-            # Detect vulnerability markers
-            if any(
-                keyword in line_lower
-                for keyword in ["vulnerability", "security", "risk", "insecure"]
-            ):
-                if current_vuln:
-                    vulnerabilities.append(current_vuln)
-
-                # Determine severity
-                severity = "medium"
-                if "critical" in line_lower:
-                    severity = "critical"
-                elif "high" in line_lower:
-                    severity = "high"
-                elif "low" in line_lower:
-                    severity = "low"
-
-                current_vuln = {
-                    "type": "security_issue",
-                    "severity": severity,
-                    "message": line.strip(),
-                    "category": "security",
-                }
-            elif current_vuln:
-                # Try to extract line number or additional info
-                if "line" in line_lower:
-                    try:
-                        import re
-
-                        line_match = re.search(r"line\s+(\d+)", line_lower)
-                        if line_match:
-                            current_vuln["line"] = int(line_match.group(1))
-                    except Exception:
-                        pass
-                current_vuln["message"] += " " + line.strip()
-
-        if current_vuln:
-            vulnerabilities.append(current_vuln)
+        # Parse LLM response
+        vulnerabilities.extend(
+            extract_issues(
+                analysis_text, _SECURITY_KEYWORDS_RE, self._new_vulnerability
+            )
+        )
 
         return vulnerabilities
 
+    def _new_vulnerability(self, line: str, line_lower: str) -> Dict[str, Any]:
+        """Build a vulnerability from its marker line."""
+        # Determine severity
+        severity = "medium"
+        if "critical" in line_lower:
+            severity = "critical"
+        elif "high" in line_lower:
+            severity = "high"
+        elif "low" in line_lower:
+            severity = "low"
+
+        return {
+            "type": "security_issue",
+            "severity": severity,
+            "message": line.strip(),
+            "category": "security",
+        }
+
     def _calculate_security_score(self, vulnerabilities: List[Dict[str, Any]]) -> float:
         """Calculate security score (0-10, higher is better)."""
         if not vulnerabilities:
             return 10.0
 
-        score = 10.0
-        for vuln in vulnerabilities:
-            severity = vuln.get("severity", "medium")
-            if severity == "critical":
-                score -= 3.0
-            elif severity == "high":
-                score -= 2.0
-            elif severity == "medium":
-                score -= 1.0
-            else:
-                score -= 0.5
+        score = 10.0 - sum(
+            _SEVERITY_PENALTY.get(vuln.get("severity", "medium"), 0.5)
+            for vuln in vulnerabilities
+        )
 
         return max(0.0, score)
@@ -4,11 +4,15 @@ Syntax Analyzer Agent for Code Review.
 Analyzes code for syntax errors, basic structure issues, and fundamental problems.
 """
 
-from typing import Any, Dict
+import re
+from typing import Any, Dict, Optional, Tuple
 
 from ..tools.ast_analyzer import ASTAnalyzer
 from .base_agent import BaseCodeReviewAgent
 
+_LINE_NUM_RE = re.compile(r"line\s+(\d+)")
+_SYNTAX_KEYWORDS_RE = re.compile(r"error|issue|problem|warning")
+
 
 class SyntaxAnalyzerAgent(BaseCodeReviewAgent):
     """
@@ -17,6 +21,9 @@ class SyntaxAnalyzerAgent(BaseCodeReviewAgent):
     Uses AST parsing to validate syntax and identify fundamental problems.
     """
 
+    # ASTAnalyzer is stateless, so all instances share one
+    ast_analyzer = ASTAnalyzer()
+
     def __init__(
         self, model_name: str = None, temperature: float = 0.1, api_key: str = None
     ):
@@ -28,14 +35,14 @@ class SyntaxAnalyzerAgent(BaseCodeReviewAgent):
             temperature: LLM temperature (very low for syntax checking)
             api_key: Gemini API key
         """
-        system_prompt = """You are a syntax analyzer for code review. Your role is to:
-1. Identify syntax errors and basic structural issues
-2. Check for missing imports or undefined references
-3. Validate code structure and indentation
-4. Identify basic type errors or obvious mistakes
-5. Report any parsing or compilation issues
+        system_prompt = """You are a syntax analyzer for code review. Report only syntax and basic structural problems (style and best practices are handled by other agents):
+1. Syntax errors
+2. Missing imports or undefined references
+3. Structure and indentation problems
+4. Basic type errors or obvious mistakes
+5. Parsing or compilation issues
 
-Be precise and focus only on syntax and basic structural problems. Don't comment on style or best practices - that's handled by other agents."""
+List each issue with its line number if possible."""
 
         super().__init__(
             role="Syntax Analyzer",
@@ -45,56 +52,81 @@ Be precise and focus only on syntax and basic structural problems. Don't comment
             api_key=api_key,
         )
 
-        self.ast_analyzer = ASTAnalyzer()
-
-    def review(self, code: str, language: str = "python", **kwargs) -> Dict[str, Any]:
+    def _prepare_review(
+        self,
+        code: str,
+        language: str,
+        ast_result: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Review code for syntax errors and basic issues.
+        Run the AST check and build the syntax analysis prompt.
 
         Args:
             code: Source code to review
             language: Programming language
+            ast_result: ASTAnalyzer.parse result shared by the caller
+                (parsed here when not provided)
             **kwargs: Additional parameters
 
         Returns:
-            Dictionary with syntax analysis results
+            Tuple of the prompt text and the review state
         """
         # First, use AST analyzer for Python
-        ast_result = {}
-        if language.lower() == "python":
+        if language.lower() != "python":
+            ast_result = {}
+        elif ast_result is None:
             ast_result = self.ast_analyzer.parse(code, language)
 
         # Prepare analysis prompt
+        prompt_code = self._code_for_prompt(code)
         analysis_input = f"""Code to analyze ({language}):
 
 ```{language}
-{code}
-```
+{prompt_code}
+```"""
+
+        # Only Python gets an AST check; other languages send the code alone
+        if ast_result:
+            analysis_input += f"""
 
 AST Analysis Results:
-{self._format_ast_results(ast_result)}
+{self._format_ast_results(ast_result)}"""
 
-Analyze this code for syntax errors and basic structural issues. Report:
-1. Any syntax errors found
-2. Missing imports or undefined references
-3. Basic structural problems
-4. Indentation issues
-5. Any parsing or compilation problems
+        return analysis_input, {"language": language, "ast_result": ast_result}
 
-Format your response clearly, listing each issue with its line number if possible."""
+    def _finalize_review(
+        self, analysis_result: str, state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build syntax analysis results from the LLM analysis.
 
-        analysis_result = self._invoke(analysis_input)
+        Args:
+            analysis_result: Text returned by the LLM
+            state: State returned by _prepare_review
+
+        Returns:
+            Dictionary with syntax analysis results
+        """
+        language = state["language"]
+        ast_result = state["ast_result"]
 
         # Compile results
         issues = self._extract_issues(analysis_result, ast_result)
 
+        # The parsed tree is only for the agents; keeping it out of the
+        # results keeps them small, picklable and JSON serializable
+        ast_info = {
+            key: value for key, value in (ast_result or {}).items() if key != "ast_tree"
+        }
+
         return {
             "agent": self.role,
             "language": language,
             "syntax_valid": ast_result.get("valid", True) if ast_result else True,
             "issues": issues,
             "issue_count": len(issues),
-            "ast_info": ast_result if ast_result else {},
+            "ast_info": ast_info,
             "analysis": analysis_result,
             "severity": "high" if issues else "none",
         }
@@ -139,10 +171,7 @@ Format your response clearly, listing each issue with its line number if possibl
             line_lower = line.lower()
 
             # Detect issue markers
-            if any(
-                keyword in line_lower
-                for keyword in ["error", "issue", "problem", "warning"]
-            ):
+            if _SYNTAX_KEYWORDS_RE.search(line_lower):
                 if current_issue:
                     issues.append(current_issue)
 
@@ -152,16 +181,11 @@ Format your response clearly, listing each issue with its line number if possibl
                     "message": line.strip(),
                     "category": "syntax",
                 }
-            elif current_issue and ("line" in line_lower or ":" in line):
-                # Try to extract line number
-                try:
-                    import re
-
-                    line_match = re.search(r"line\s+(\d+)", line_lower)
-                    if line_match:
-                        current_issue["line"] = int(line_match.group(1))
-                except Exception:
-                    pass
+            elif current_issue and "line" in line_lower:
+                # Try to extract line number (the regex needs "line" anyway)
+                line_match = _LINE_NUM_RE.search(line_lower)
+                if line_match:
+                    current_issue["line"] = int(line_match.group(1))
 
         if current_issue:
             issues.append(current_issue)
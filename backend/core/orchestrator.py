@@ -4,17 +4,47 @@ Main Orchestrator for the Code Review Agent System.
 Coordinates all specialized agents and manages the code review workflow.
 """
 
-from typing import Any, Dict, List, Optional
-
-from ..agents.best_practices_agent import BestPracticesAgent
-from ..agents.documentation_agent import DocumentationAgent
-from ..agents.performance_agent import PerformanceAgent
-from ..agents.security_agent import SecurityAgent
-from ..agents.style_agent import StyleAgent
-from ..agents.syntax_analyzer import SyntaxAnalyzerAgent
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
 from ..tools.ast_analyzer import ASTAnalyzer
 from ..tools.dependency_checker import DependencyChecker
 from ..tools.metrics_calculator import MetricsCalculator
+from .result_cache import MAX_CACHE_ENTRIES, ReviewResultCache
+
+# Agents (and LangChain behind them) are imported when first used
+if TYPE_CHECKING:
+    from ..agents.best_practices_agent import BestPracticesAgent
+    from ..agents.combined_agent import CombinedReviewAgent
+    from ..agents.documentation_agent import DocumentationAgent
+    from ..agents.performance_agent import PerformanceAgent
+    from ..agents.security_agent import SecurityAgent
+    from ..agents.style_agent import StyleAgent
+    from ..agents.syntax_analyzer import SyntaxAnalyzerAgent
+
+# Agent name (as used in include_agents and agent_results) -> orchestrator
+# attribute holding the agent, in review order
+AGENT_ATTRIBUTES = {
+    "syntax": "syntax_agent",
+    "security": "security_agent",
+    "performance": "performance_agent",
+    "style": "style_agent",
+    "best_practices": "best_practices_agent",
+    "documentation": "documentation_agent",
+}
+
+# Agent result key holding a score -> name of the score in the summary
+SCORE_KEYS = (
+    ("security_score", "security"),
+    ("performance_score", "performance"),
+    ("style_score", "style"),
+    ("best_practices_score", "best_practices"),
+    ("documentation_score", "documentation"),
+)
 
 
 class CodeReviewOrchestrator:
@@ -45,34 +75,82 @@ class CodeReviewOrchestrator:
             temperature: LLM temperature
             api_key: Gemini API key
         """
+        self.model_name = model_name
+        self.api_key = api_key
+
+        # Combined agents for batched reviews, keyed by agent selection
+        self._combined_agents: Dict[Tuple[str, ...], "CombinedReviewAgent"] = {}
+
+        # Finished reviews persisted across runs, when caching is enabled
+        self.result_cache = None
+        if os.getenv("CODE_REVIEW_CACHE") == "1":
+            self.result_cache = ReviewResultCache(
+                os.getenv("REVIEW_CACHE_PATH", ".review_cache.db"),
+                max_entries=int(
+                    os.getenv("REVIEW_CACHE_MAX_ENTRIES", str(MAX_CACHE_ENTRIES))
+                ),
+            )
+
         # Initialize tools
         self.ast_analyzer = ASTAnalyzer()
         self.dependency_checker = DependencyChecker()
         self.metrics_calculator = MetricsCalculator()
 
-        # Initialize all agents
-        self.syntax_agent = SyntaxAnalyzerAgent(
-            model_name=model_name, temperature=0.1, api_key=api_key
+        # Agents are created on first use (see the properties below), so a
+        # review that selects only some of them never builds the rest
+
+    @cached_property
+    def syntax_agent(self) -> "SyntaxAnalyzerAgent":
+        """Syntax analyzer agent, created on first use."""
+        from ..agents.syntax_analyzer import SyntaxAnalyzerAgent
+
+        return SyntaxAnalyzerAgent(
+            model_name=self.model_name, temperature=0.1, api_key=self.api_key
         )
 
-        self.security_agent = SecurityAgent(
-            model_name=model_name, temperature=0.2, api_key=api_key
+    @cached_property
+    def security_agent(self) -> "SecurityAgent":
+        """Security agent, created on first use."""
+        from ..agents.security_agent import SecurityAgent
+
+        return SecurityAgent(
+            model_name=self.model_name, temperature=0.2, api_key=self.api_key
         )
 
-        self.performance_agent = PerformanceAgent(
-            model_name=model_name, temperature=0.3, api_key=api_key
+    @cached_property
+    def performance_agent(self) -> "PerformanceAgent":
+        """Performance agent, created on first use."""
+        from ..agents.performance_agent import PerformanceAgent
+
+        return PerformanceAgent(
+            model_name=self.model_name, temperature=0.3, api_key=self.api_key
         )
 
-        self.style_agent = StyleAgent(
-            model_name=model_name, temperature=0.3, api_key=api_key
+    @cached_property
+    def style_agent(self) -> "StyleAgent":
+        """Style agent, created on first use."""
+        from ..agents.style_agent import StyleAgent
+
+        return StyleAgent(
+            model_name=self.model_name, temperature=0.3, api_key=self.api_key
         )
 
-        self.best_practices_agent = BestPracticesAgent(
-            model_name=model_name, temperature=0.3, api_key=api_key
+    @cached_property
+    def best_practices_agent(self) -> "BestPracticesAgent":
+        """Best practices agent, created on first use."""
+        from ..agents.best_practices_agent import BestPracticesAgent
+
+        return BestPracticesAgent(
+            model_name=self.model_name, temperature=0.3, api_key=self.api_key
         )
 
-        self.documentation_agent = DocumentationAgent(
-            model_name=model_name, temperature=0.3, api_key=api_key
+    @cached_property
+    def documentation_agent(self) -> "DocumentationAgent":
+        """Documentation agent, created on first use."""
+        from ..agents.documentation_agent import DocumentationAgent
+
+        return DocumentationAgent(
+            model_name=self.model_name, temperature=0.3, api_key=self.api_key
         )
 
     def review(
@@ -80,39 +158,185 @@ class CodeReviewOrchestrator:
         code: str,
         language: str = "python",
         include_agents: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        batched: bool = False,
+        fail_fast: bool = True,
+        on_agent_complete: Optional[Callable[[str, Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
         Conduct comprehensive code review using all agents.
 
+        The agents wait on the LLM, so they run in a thread pool and the
+        review takes as long as the slowest agent rather than all of them.
+
         Args:
             code: Source code to review
             language: Programming language
             include_agents: Optional list of agent names to include
                           (if None, includes all agents)
+            max_concurrency: Optional cap on agents running at once
+            batched: Ask all agents' questions in a single LLM call, falling
+                back to one call per agent if the response cannot be split
+            fail_fast: When Python code does not parse and include_agents is
+                not given, run only the syntax agent
+            on_agent_complete: Optional callback called with each agent's name
+                and result as soon as that agent finishes, from the calling
+                thread (not called for results served from the cache)
 
         Returns:
             Complete review result with all agent findings
         """
+        cache_key = self._result_cache_key(
+            code, language, include_agents, batched, fail_fast
+        )
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        results, agents, shared = self._start_review(
+            code, language, include_agents, fail_fast
+        )
+        if not agents:
+            return self._finish_review(results, cache_key)
+
+        if batched:
+            try:
+                combined = self._get_combined_agent(agents).review(
+                    code, language, **shared
+                )
+            except Exception:
+                combined = None
+            if self._apply_combined(results, combined):
+                if on_agent_complete is not None:
+                    for name, _ in agents:
+                        on_agent_complete(name, results["agent_results"][name])
+                return self._finish_review(results, cache_key)
+
+        # Use individual agents for specific checks
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=max_concurrency or len(agents)) as pool:
+            futures = {
+                pool.submit(agent.review, code, language, **shared): name
+                for name, agent in agents
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    outcomes[name] = future.result()
+                except Exception as e:
+                    outcomes[name] = {"error": str(e), "skipped": True}
+                if on_agent_complete is not None:
+                    on_agent_complete(name, outcomes[name])
+
+        # Keep agent results in review order, not completion order
+        for name, _ in agents:
+            results["agent_results"][name] = outcomes[name]
+
+        return self._finish_review(results, cache_key)
+
+    async def areview(
+        self,
+        code: str,
+        language: str = "python",
+        include_agents: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        batched: bool = False,
+        fail_fast: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Conduct comprehensive code review, running the agents concurrently.
+
+        Args:
+            code: Source code to review
+            language: Programming language
+            include_agents: Optional list of agent names to include
+                          (if None, includes all agents)
+            max_concurrency: Optional cap on simultaneous LLM requests
+            batched: Ask all agents' questions in a single LLM call, falling
+                back to one call per agent if the response cannot be split
+            fail_fast: When Python code does not parse and include_agents is
+                not given, run only the syntax agent
+
+        Returns:
+            Complete review result with all agent findings
+        """
+        cache_key = self._result_cache_key(
+            code, language, include_agents, batched, fail_fast
+        )
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        results, agents, shared = self._start_review(
+            code, language, include_agents, fail_fast
+        )
+
+        if batched and agents:
+            try:
+                combined = await self._get_combined_agent(agents).areview(
+                    code, language, **shared
+                )
+            except Exception:
+                combined = None
+            if self._apply_combined(results, combined):
+                return self._finish_review(results, cache_key)
+
+        from ..agents.base_agent import run_all_parallel
+
+        outcomes = await run_all_parallel(
+            code,
+            language,
+            [agent for _, agent in agents],
+            max_concurrency=max_concurrency,
+            **shared,
+        )
+        for (name, _), outcome in zip(agents, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = {"error": str(outcome), "skipped": True}
+            results["agent_results"][name] = outcome
+
+        return self._finish_review(results, cache_key)
+
+    def _start_review(
+        self,
+        code: str,
+        language: str,
+        include_agents: Optional[List[str]],
+        fail_fast: bool = True,
+    ) -> Tuple[Dict[str, Any], List[Tuple[str, Any]], Dict[str, Any]]:
+        """
+        Run the shared analysis and select the agents for a review.
+
+        Args:
+            code: Source code to review
+            language: Programming language
+            include_agents: Optional list of agent names to include
+            fail_fast: Skip every agent but syntax for unparseable Python
+                when include_agents is not given
+
+        Returns:
+            Tuple of the partial review result, the (name, agent) pairs to
+            run in order, and the keyword arguments shared by every agent
+        """
         if not code or not code.strip():
             raise ValueError("Code cannot be empty")
 
         # Default to all agents if not specified
-        if include_agents is None:
-            include_agents = [
-                "syntax",
-                "security",
-                "performance",
-                "style",
-                "best_practices",
-                "documentation",
-            ]
-
-        # No logging for clean execution unless requested
-        pass
-
-        # Calculate basic metrics first
-        metrics = self.metrics_calculator.calculate_metrics(code, language)
-        dependencies = self.dependency_checker.check_dependencies(code, language)
+        wanted = set(include_agents or AGENT_ATTRIBUTES)
+
+        # Parse and split once and share the results with every agent
+        ast_result = None
+        if language.lower() == "python":
+            ast_result = self.ast_analyzer.parse(code, language)
+        shared = {"ast_result": ast_result, "lines": code.split("\n")}
+
+        # Calculate basic metrics
+        metrics = self.metrics_calculator.calculate_metrics(
+            code, language, lines=shared["lines"]
+        )
+        dependencies = self.dependency_checker.check_dependencies(
+            code, language, ast_result=ast_result
+        )
 
         results = {
             "code": code,
@@ -123,52 +347,96 @@ class CodeReviewOrchestrator:
             "summary": {},
         }
 
-        # Use individual agents for specific checks
-        try:
-            if not include_agents or "syntax" in include_agents:
-                results["agent_results"]["syntax"] = self.syntax_agent.review(code, language)
-        except Exception as e:
-            results["agent_results"]["syntax"] = {"error": str(e), "skipped": True}
-
-        try:
-            if not include_agents or "security" in include_agents:
-                results["agent_results"]["security"] = self.security_agent.review(code, language)
-        except Exception as e:
-            results["agent_results"]["security"] = {"error": str(e), "skipped": True}
-
-        try:
-            if not include_agents or "performance" in include_agents:
-                results["agent_results"]["performance"] = self.performance_agent.review(
-                    code, language
-                )
-        except Exception as e:
-            results["agent_results"]["performance"] = {"error": str(e), "skipped": True}
-
-        try:
-            if not include_agents or "style" in include_agents:
-                results["agent_results"]["style"] = self.style_agent.review(code, language)
-        except Exception as e:
-            results["agent_results"]["style"] = {"error": str(e), "skipped": True}
-
-        try:
-            if not include_agents or "best_practices" in include_agents:
-                results["agent_results"]["best_practices"] = self.best_practices_agent.review(
-                    code, language
-                )
-        except Exception as e:
-            results["agent_results"]["best_practices"] = {"error": str(e), "skipped": True}
+        # Code that does not parse only needs its syntax errors reported,
+        # unless the caller asked for specific agents
+        if (
+            fail_fast
+            and not include_agents
+            and ast_result is not None
+            and not ast_result.get("valid")
+        ):
+            for name in AGENT_ATTRIBUTES:
+                if name != "syntax":
+                    results["agent_results"][name] = {
+                        "skipped": True,
+                        "reason": "Code has syntax errors",
+                    }
+            wanted = {"syntax"}
+
+        agents = [
+            (name, getattr(self, attribute))
+            for name, attribute in AGENT_ATTRIBUTES.items()
+            if name in wanted
+        ]
+
+        return results, agents, shared
+
+    def _get_combined_agent(
+        self, agents: List[Tuple[str, Any]]
+    ) -> "CombinedReviewAgent":
+        """Return the combined agent batching the given (name, agent) pairs."""
+        from ..agents.combined_agent import CombinedReviewAgent
+
+        key = tuple(name for name, _ in agents)
+        combined = self._combined_agents.get(key)
+        if combined is None:
+            combined = CombinedReviewAgent(
+                model_name=self.model_name,
+                api_key=self.api_key,
+                agents=dict(agents),
+            )
+            self._combined_agents[key] = combined
+        return combined
 
-        try:
-            if not include_agents or "documentation" in include_agents:
-                results["agent_results"]["documentation"] = self.documentation_agent.review(
-                    code, language
-                )
-        except Exception as e:
-            results["agent_results"]["documentation"] = {"error": str(e), "skipped": True}
+    def _apply_combined(
+        self, results: Dict[str, Any], combined: Optional[Dict[str, Any]]
+    ) -> bool:
+        """
+        Store a combined review's per-agent results.
+
+        Returns:
+            False when the combined review failed or its response could not
+            be split per agent, so the agents should be run one by one
+        """
+        if not combined or not combined.get("sections_parsed"):
+            return False
+
+        results["agent_results"].update(combined["results"])
+        return True
 
-        # Generate summary
+    def _result_cache_key(
+        self,
+        code: str,
+        language: str,
+        include_agents: Optional[List[str]],
+        batched: bool,
+        fail_fast: bool,
+    ) -> Optional[str]:
+        """Build the persistent cache key for a review, or None when disabled."""
+        if self.result_cache is None:
+            return None
+
+        agents = ",".join(sorted(include_agents or AGENT_ATTRIBUTES))
+        model = self.model_name or os.getenv("GEMINI_MODEL", "")
+        key = "\0".join((code, language, agents, model, str(batched), str(fail_fast)))
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _get_cached_result(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the persisted result for cache_key, or None on a miss."""
+        if cache_key is None:
+            return None
+        return self.result_cache.get(cache_key)
+
+    def _finish_review(
+        self, results: Dict[str, Any], cache_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Add the summary to a review result once every agent has run."""
         results["summary"] = self._generate_summary(results)
 
+        # Failed agents may succeed on a retry, so only clean runs persist
+        if cache_key is not None and not results["summary"]["agents_failed"]:
+            self.result_cache.set(cache_key, results)
+
         print("[Orchestrator] Code review complete!")
 
         return results
@@ -185,45 +453,38 @@ class CodeReviewOrchestrator:
         """
         agent_results = results.get("agent_results", {})
 
-        # Collect all issues
-        all_issues = []
-        critical_issues = []
-        high_issues = []
+        # Count issues by severity and agents by outcome in one pass
+        severity_counts: Counter = Counter()
+        total_issues = 0
+        agents_run = agents_failed = 0
 
         # Collect scores
         scores = {}
 
         for agent_name, agent_result in agent_results.items():
-            if agent_result.get("skipped") or agent_result.get("error"):
+            if agent_result.get("error"):
+                agents_failed += 1
+                continue
+            if agent_result.get("skipped"):
                 continue
+            agents_run += 1
 
             # Collect issues
             issues = agent_result.get("issues", []) or agent_result.get(
                 "vulnerabilities", []
             )
+            total_issues += len(issues)
             for issue in issues:
                 issue["agent"] = agent_name
-                all_issues.append(issue)
-
-                severity = issue.get("severity", "medium")
-                if severity == "critical":
-                    critical_issues.append(issue)
-                elif severity == "high":
-                    high_issues.append(issue)
+            # Counter.update counts a list in C, unlike per-issue += 1
+            severity_counts.update([issue.get("severity") for issue in issues])
 
             # Collect scores
             if "syntax_valid" in agent_result:
                 scores["syntax"] = 10.0 if agent_result["syntax_valid"] else 0.0
-            if "security_score" in agent_result:
-                scores["security"] = agent_result["security_score"]
-            if "performance_score" in agent_result:
-                scores["performance"] = agent_result["performance_score"]
-            if "style_score" in agent_result:
-                scores["style"] = agent_result["style_score"]
-            if "best_practices_score" in agent_result:
-                scores["best_practices"] = agent_result["best_practices_score"]
-            if "documentation_score" in agent_result:
-                scores["documentation"] = agent_result["documentation_score"]
+            for result_key, score_name in SCORE_KEYS:
+                if result_key in agent_result:
+                    scores[score_name] = agent_result[result_key]
 
         # Calculate overall score
         if scores:
@@ -231,32 +492,27 @@ class CodeReviewOrchestrator:
         else:
             overall_score = 0.0
 
+        critical_issues = severity_counts["critical"]
+        high_issues = severity_counts["high"]
+
         # Determine overall severity
         overall_severity = "none"
         if critical_issues:
             overall_severity = "critical"
         elif high_issues:
             overall_severity = "high"
-        elif all_issues:
+        elif total_issues:
             overall_severity = "medium"
 
         return {
-            "total_issues": len(all_issues),
-            "critical_issues": len(critical_issues),
-            "high_issues": len(high_issues),
-            "medium_issues": len(
-                [i for i in all_issues if i.get("severity") == "medium"]
-            ),
-            "low_issues": len([i for i in all_issues if i.get("severity") == "low"]),
+            "total_issues": total_issues,
+            "critical_issues": critical_issues,
+            "high_issues": high_issues,
+            "medium_issues": severity_counts["medium"],
+            "low_issues": severity_counts["low"],
             "scores": scores,
             "overall_score": overall_score,
             "overall_severity": overall_severity,
-            "agents_run": len(
-                [
-                    r
-                    for r in agent_results.values()
-                    if not r.get("skipped") and not r.get("error")
-                ]
-            ),
-            "agents_failed": len([r for r in agent_results.values() if r.get("error")]),
+            "agents_run": agents_run,
+            "agents_failed": agents_failed,
         }
@@ -4,9 +4,29 @@ Report Generator for Code Review Agent.
 Generates comprehensive, formatted reports from code review results.
 """
 
+import json
 from datetime import datetime
 from typing import Any, Dict
 
+try:
+    import orjson  # type: ignore
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Markdown markers and status symbols mapped to their plain text form
+_TEXT_TABLE = str.maketrans(
+    {
+        "#": "",
+        "✓": "[OK]",
+        "✗": "[ERROR]",
+        "🔴": "[CRITICAL]",
+        "🟠": "[HIGH]",
+        "🟡": "[MEDIUM]",
+    }
+)
+
 
 class ReportGenerator:
     """
@@ -40,12 +60,22 @@ class ReportGenerator:
         elif format_type.lower() == "text":
             return self._generate_text_report(review_results)
         elif format_type.lower() == "json":
-            import json
-
-            return json.dumps(review_results, indent=2)
+            return self._generate_json_report(review_results)
         else:
             return self._generate_markdown_report(review_results)
 
+    def _generate_json_report(self, results: Dict[str, Any]) -> str:
+        """Generate JSON formatted report, using orjson when installed."""
+        # Any value JSON has no type for is written as its str()
+        if _HAS_ORJSON:
+            return orjson.dumps(
+                results,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            ).decode()
+
+        return json.dumps(results, indent=2, default=str)
+
     def _generate_markdown_report(self, results: Dict[str, Any]) -> str:
         """Generate markdown formatted report."""
         report = []
@@ -289,14 +319,5 @@ class ReportGenerator:
         # Convert markdown to plain text (simple version)
         markdown_report = self._generate_markdown_report(results)
 
-        # Remove markdown formatting
-        text_report = markdown_report
-        text_report = text_report.replace("**", "")
-        text_report = text_report.replace("#", "")
-        text_report = text_report.replace("✓", "[OK]")
-        text_report = text_report.replace("✗", "[ERROR]")
-        text_report = text_report.replace("🔴", "[CRITICAL]")
-        text_report = text_report.replace("🟠", "[HIGH]")
-        text_report = text_report.replace("🟡", "[MEDIUM]")
-
-        return text_report
+        # Remove markdown formatting; the single characters go in one pass
+        return markdown_report.replace("**", "").translate(_TEXT_TABLE)
@@ -0,0 +1,80 @@
+"""
+Persistent cache of complete review results.
+
+Stores finished orchestrator reviews in a local SQLite file so re-reviewing
+unchanged code (CI re-runs, review on save) skips every LLM call and all of
+the local analysis.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Entries kept before the oldest are pruned
+MAX_CACHE_ENTRIES = 1000
+
+
+class ReviewResultCache:
+    """
+    SQLite-backed store of review results keyed by an opaque string.
+
+    The connection is shared between threads, so access is serialized with a
+    lock; WAL mode lets other processes read while one writes. Results are
+    stored as JSON text, so a tampered database file cannot run code.
+    """
+
+    def __init__(self, path: str, max_entries: int = MAX_CACHE_ENTRIES):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept; storing more evicts the least
+                recently written
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS review_cache "
+                "(key TEXT PRIMARY KEY, ts INTEGER, payload BLOB)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM review_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            # Unreadable entries (e.g. written by an older version) are misses
+            return None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store result under key, replacing any previous entry."""
+        payload = json.dumps(result)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO review_cache (key, ts, payload) "
+                "VALUES (?, ?, ?)",
+                (key, int(time.time()), payload),
+            )
+            # A replaced row gets a new rowid, which orders writes made
+            # within the same second
+            self._conn.execute(
+                "DELETE FROM review_cache WHERE key NOT IN "
+                "(SELECT key FROM review_cache ORDER BY ts DESC, rowid DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
@@ -5,7 +5,42 @@ Parses code into Abstract Syntax Trees and extracts structural information.
 """
 
 import ast
-from typing import Any, Dict, List
+import copy
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Tuple, Union
+
+# Number of parse results kept for repeated analysis of the same code
+PARSE_CACHE_SIZE = 32
+
+# Statements counted as decision points by the cyclomatic complexity
+_DECISION_NODES = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.Try,
+    ast.With,
+    ast.AsyncWith,
+)
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _decorator_source(node: ast.expr) -> str:
+    """Source text of a decorator; plain names skip the unparser."""
+    if isinstance(node, ast.Name):
+        return node.id
+    return ast.unparse(node)
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached parse result, sharing only the (read-only) AST."""
+    return {
+        key: value if key == "ast_tree" else copy.deepcopy(value)
+        for key, value in result.items()
+    }
 
 
 class ASTAnalyzer:
@@ -19,20 +54,29 @@ class ASTAnalyzer:
     - Complexity metrics
     """
 
+    # Parse results shared by every analyzer, keyed by code hash and language
+    _parse_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+    _parse_cache_lock = threading.Lock()
+
     def __init__(self):
         """Initialize the AST analyzer."""
         pass
 
-    def parse(self, code: str, language: str = "python") -> Dict[str, Any]:
+    def parse(
+        self, code: Union[str, bytes], language: str = "python"
+    ) -> Dict[str, Any]:
         """
         Parse code into AST and extract information.
 
         Args:
-            code: Source code to analyze
+            code: Source code to analyze; bytes (e.g. an uploaded file) are
+                decoded by the parser, honoring any PEP 263 coding cookie
             language: Programming language (currently supports python)
 
         Returns:
-            Dictionary with AST information and metrics
+            Dictionary with AST information and metrics. Results for the same
+            code are cached; each caller gets its own copy of the extracted
+            values, but ast_tree is shared and must be treated as read-only.
         """
         if language.lower() != "python":
             return {
@@ -41,14 +85,37 @@ class ASTAnalyzer:
                 "language": language,
             }
 
+        # Bytes are hashed as they are, under a separator of their own: with a
+        # coding cookie they may not decode to the str of the same bytes
+        hasher = hashlib.blake2b(digest_size=16)
+        if isinstance(code, bytes):
+            hasher.update(f"{language}\1".encode("utf-8"))
+            hasher.update(code)
+        else:
+            hasher.update(f"{language}\0{code}".encode("utf-8", "surrogatepass"))
+        key = hasher.digest()
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(key)
+            if cached is not None:
+                self._parse_cache.move_to_end(key)
+                return _copy_result(cached)
+
+        result = self._parse_python(code, language)
+
+        with self._parse_cache_lock:
+            self._parse_cache[key] = result
+            if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+
+        return _copy_result(result)
+
+    def _parse_python(self, code: Union[str, bytes], language: str) -> Dict[str, Any]:
+        """Parse Python code and extract information."""
         try:
             tree = ast.parse(code)
 
             # Extract information
-            functions = self._extract_functions(tree)
-            classes = self._extract_classes(tree)
-            imports = self._extract_imports(tree)
-            complexity = self._calculate_complexity(tree)
+            functions, classes, imports, complexity = self._analyze_tree(tree)
 
             return {
                 "valid": True,
@@ -76,54 +143,57 @@ class ASTAnalyzer:
                 "language": language,
             }
 
-    def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract function definitions from AST."""
-        functions = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append(
-                    {
-                        "name": node.name,
-                        "line": node.lineno,
-                        "args": len(node.args.args),
-                        "decorators": [ast.unparse(d) for d in node.decorator_list]
-                        if hasattr(ast, "unparse")
-                        else [],
-                        "has_docstring": ast.get_docstring(node) is not None,
-                    }
-                )
+    def _analyze_tree(
+        self, tree: ast.AST
+    ) -> Tuple[
+        List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]
+    ]:
+        """
+        Extract functions, classes, imports and complexity in one traversal.
 
-        return functions
+        Nodes are visited breadth-first, the same order ast.walk uses, so
+        each list keeps the order the separate walks produced.
 
-    def _extract_classes(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract class definitions from AST."""
+        Returns:
+            Tuple of (functions, classes, imports, complexity)
+        """
+        functions = []
         classes = []
+        imports = []
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                classes.append(
-                    {
-                        "name": node.name,
-                        "line": node.lineno,
-                        "methods": methods,
-                        "method_count": len(methods),
-                        "has_docstring": ast.get_docstring(node) is not None,
-                    }
-                )
+        # Plain locals are cheaper to bump than dict entries in this loop
+        cyclomatic = 1  # Base complexity
+        max_nesting = function_count = class_count = 0
 
-        return classes
+        queue = deque([(tree, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if depth > max_nesting:
+                max_nesting = depth
+            queue.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
 
-    def _extract_imports(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract import statements from AST."""
-        imports = []
+            # Everything below is a statement; most nodes are expressions
+            if not isinstance(node, ast.stmt):
+                continue
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
+            # Count decision points (if, for, while, etc.)
+            if isinstance(node, _DECISION_NODES):
+                cyclomatic += 1
+            elif isinstance(node, _FUNCTION_NODES):
+                function_count += 1
+                functions.append(self._function_info(node))
+            elif isinstance(node, ast.ClassDef):
+                class_count += 1
+                classes.append(self._class_info(node))
+            elif isinstance(node, ast.Import):
                 for alias in node.names:
                     imports.append(
-                        {"module": alias.name, "alias": alias.asname, "type": "import"}
+                        {
+                            "module": alias.name,
+                            "alias": alias.asname,
+                            "type": "import",
+                            "line": node.lineno,
+                        }
                     )
             elif isinstance(node, ast.ImportFrom):
                 imports.append(
@@ -131,37 +201,64 @@ class ASTAnalyzer:
                         "module": node.module or "",
                         "names": [alias.name for alias in node.names],
                         "type": "from_import",
+                        "level": node.level,
+                        "line": node.lineno,
                     }
                 )
 
-        return imports
-
-    def _calculate_complexity(self, tree: ast.AST) -> Dict[str, int]:
-        """Calculate basic complexity metrics."""
         complexity = {
-            "cyclomatic": 1,  # Base complexity
-            "max_nesting": 0,
-            "function_count": 0,
-            "class_count": 0,
+            "cyclomatic": cyclomatic,
+            "max_nesting": max_nesting,
+            "function_count": function_count,
+            "class_count": class_count,
         }
+        return functions, classes, imports, complexity
 
-        def visit_node(node, depth=0):
-            complexity["max_nesting"] = max(complexity["max_nesting"], depth)
-
-            # Count decision points (if, for, while, etc.)
-            if isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.With)):
-                complexity["cyclomatic"] += 1
-
-            if isinstance(node, ast.FunctionDef):
-                complexity["function_count"] += 1
-
-            if isinstance(node, ast.ClassDef):
-                complexity["class_count"] += 1
+    def _function_info(
+        self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+    ) -> Dict[str, Any]:
+        """Describe a function definition."""
+        return {
+            "name": node.name,
+            "line": node.lineno,
+            "args": len(node.args.args),
+            "decorators": (
+                [_decorator_source(d) for d in node.decorator_list]
+                if hasattr(ast, "unparse")
+                else []
+            ),
+            "has_docstring": ast.get_docstring(node) is not None,
+        }
 
-            # Recursively visit children
-            for child in ast.iter_child_nodes(node):
-                visit_node(child, depth + 1)
+    def _class_info(self, node: ast.ClassDef) -> Dict[str, Any]:
+        """Describe a class definition."""
+        methods = self._method_names(node.body)
+        return {
+            "name": node.name,
+            "line": node.lineno,
+            "methods": methods,
+            "method_count": len(methods),
+            "has_docstring": ast.get_docstring(node) is not None,
+        }
 
-        visit_node(tree)
+    def _method_names(self, body: List[ast.stmt]) -> List[str]:
+        """
+        Names of the functions defined in a class body, in source order.
 
-        return complexity
+        Methods defined under if/try guards (e.g. "if TYPE_CHECKING:") in the
+        class body are included.
+        """
+        names = []
+        for stmt in body:
+            if isinstance(stmt, _FUNCTION_NODES):
+                names.append(stmt.name)
+            elif isinstance(stmt, ast.If):
+                names.extend(self._method_names(stmt.body + stmt.orelse))
+            elif isinstance(stmt, ast.Try):
+                handlers = [n for handler in stmt.handlers for n in handler.body]
+                names.extend(
+                    self._method_names(
+                        stmt.body + handlers + stmt.orelse + stmt.finalbody
+                    )
+                )
+        return names
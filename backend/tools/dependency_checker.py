@@ -5,7 +5,9 @@ Checks for insecure or outdated dependencies.
 """
 
 import re
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+_IMPORT_RE = re.compile(r"^(?:from\s+(\S+)\s+)?import\s+(\S+)")
 
 
 class DependencyChecker:
@@ -17,13 +19,20 @@ class DependencyChecker:
         """Initialize the dependency checker."""
         pass
 
-    def check_dependencies(self, code: str, language: str = "python") -> Dict[str, Any]:
+    def check_dependencies(
+        self,
+        code: str,
+        language: str = "python",
+        ast_result: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Check dependencies in code.
 
         Args:
             code: Source code to analyze
             language: Programming language
+            ast_result: ASTAnalyzer.parse result shared by the caller; when
+                it is valid its imports are used instead of scanning the code
 
         Returns:
             Dictionary with dependency information
@@ -31,22 +40,46 @@ class DependencyChecker:
         dependencies = []
 
         if language.lower() == "python":
-            # Extract import statements
-            import_pattern = r"^(?:from\s+(\S+)\s+)?import\s+(\S+)"
-            for line in code.split("\n"):
-                match = re.match(import_pattern, line.strip())
-                if match:
-                    module = match.group(1) or match.group(2)
-                    if module:
-                        dependencies.append(
-                            {
-                                "module": module.split(".")[0],
-                                "line": code.split("\n").index(line) + 1,
-                            }
-                        )
+            if ast_result and ast_result.get("valid"):
+                dependencies = self._dependencies_from_imports(ast_result["imports"])
+            else:
+                dependencies = self._scan_imports(code)
 
         return {
             "dependencies": dependencies,
             "dependency_count": len(dependencies),
             "language": language,
         }
+
+    def _dependencies_from_imports(
+        self, imports: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Build dependencies from ASTAnalyzer import entries."""
+        dependencies = [
+            {"module": imp["module"].split(".")[0], "line": imp["line"]}
+            for imp in imports
+            # Relative imports refer to the package itself
+            if imp["module"] and not imp.get("level")
+        ]
+
+        # The AST walk is breadth-first; report imports in source order
+        dependencies.sort(key=lambda dep: dep["line"])
+        return dependencies
+
+    def _scan_imports(self, code: str) -> List[Dict[str, Any]]:
+        """Find imports line by line, for code that does not parse."""
+        dependencies = []
+
+        for line_no, line in enumerate(code.split("\n"), 1):
+            match = _IMPORT_RE.match(line.strip())
+            if match:
+                module = match.group(1) or match.group(2)
+                if module:
+                    dependencies.append(
+                        {
+                            "module": module.split(".")[0],
+                            "line": line_no,
+                        }
+                    )
+
+        return dependencies
@@ -4,7 +4,7 @@ Metrics Calculator Tool for Code Review Agent.
 Calculates various code metrics for analysis.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 
 class MetricsCalculator:
@@ -16,35 +16,42 @@ class MetricsCalculator:
         """Initialize the metrics calculator."""
         pass
 
-    def calculate_metrics(self, code: str, language: str = "python") -> Dict[str, Any]:
+    def calculate_metrics(
+        self, code: str, language: str = "python", lines: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate code metrics.
 
         Args:
             code: Source code to analyze
             language: Programming language
+            lines: code.split("\n") shared by the caller
+                (split here when not provided)
 
         Returns:
             Dictionary with calculated metrics
         """
-        lines = code.split("\n")
+        if lines is None:
+            lines = code.split("\n")
+
+        # Classify every line in one pass
+        code_lines = comment_lines = blank_lines = total_length = 0
+        for line in lines:
+            total_length += len(line)
+            stripped = line.lstrip()
+            if not stripped:
+                blank_lines += 1
+            elif stripped[0] == "#":
+                comment_lines += 1
+            else:
+                code_lines += 1
 
         metrics = {
             "total_lines": len(lines),
-            "code_lines": len(
-                [
-                    line
-                    for line in lines
-                    if line.strip() and not line.strip().startswith("#")
-                ]
-            ),
-            "comment_lines": len(
-                [line for line in lines if line.strip().startswith("#")]
-            ),
-            "blank_lines": len([line for line in lines if not line.strip()]),
-            "average_line_length": sum(len(line) for line in lines) / len(lines)
-            if lines
-            else 0,
+            "code_lines": code_lines,
+            "comment_lines": comment_lines,
+            "blank_lines": blank_lines,
+            "average_line_length": total_length / len(lines) if lines else 0,
             "language": language,
         }
 
@@ -23,7 +23,7 @@ def create_llm(
     api_key: Optional[str] = None,
 ) -> object:
     gemini_key = api_key or os.getenv("GEMINI_API_KEY")
-    gemini_model = model_name or os.getenv("GEMINI_MODEL", "gemini-pro")
+    gemini_model = model_name or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 
     if not gemini_key:
         raise ValueError("GEMINI_API_KEY environment variable is required")
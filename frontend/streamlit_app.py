@@ -2,14 +2,17 @@
 Main Streamlit Application for the Code Review Agent System.
 """
 
+import os
 import sys
 from pathlib import Path
 
 import streamlit as st
+from dotenv import load_dotenv
 
-# Add backend to path
+# Add backend to path (once; the script reruns on every interaction)
 backend_path = Path(__file__).parent.parent / "backend"
-sys.path.insert(0, str(backend_path.parent))
+if str(backend_path.parent) not in sys.path:
+    sys.path.insert(0, str(backend_path.parent))
 
 # Import at top level to avoid E402
 from backend.core.orchestrator import CodeReviewOrchestrator  # noqa: E402
@@ -23,15 +26,80 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Initialize session state
-if "orchestrator" not in st.session_state:
-    try:
-        st.session_state.orchestrator = CodeReviewOrchestrator()
-        st.session_state.review_result = None
-    except Exception as e:
-        st.error(f"Failed to initialize orchestrator: {str(e)}")
-        st.info("Make sure GEMINI_API_KEY is set in your .env file")
-        st.stop()
+
+@st.cache_resource
+def get_orchestrator() -> CodeReviewOrchestrator:
+    """Create the orchestrator once, shared by every rerun and session."""
+    # The agents build their LLM clients lazily, so check the key up front
+    # rather than failing on the first review
+    load_dotenv()
+    if not os.getenv("GEMINI_API_KEY"):
+        raise ValueError("GEMINI_API_KEY environment variable is required")
+    return CodeReviewOrchestrator()
+
+
+@st.cache_resource
+def get_report_generator() -> ReportGenerator:
+    """Create the report generator once, shared by every rerun and session."""
+    return ReportGenerator()
+
+
+# Initialize the orchestrator and session state
+try:
+    get_orchestrator()
+except Exception as e:
+    st.error(f"Failed to initialize orchestrator: {str(e)}")
+    st.info("Make sure GEMINI_API_KEY is set in your .env file")
+    st.stop()
+
+if "review_result" not in st.session_state:
+    st.session_state.review_result = None
+    st.session_state.reports = {}
+
+
+class _IncompleteReview(Exception):
+    """Carries a review in which some agents failed, so it is not cached."""
+
+    def __init__(self, result: dict):
+        super().__init__("Some agents failed")
+        self.result = result
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _run_review(
+    _orchestrator: CodeReviewOrchestrator,
+    code: str,
+    language: str,
+    agents: tuple,
+) -> dict:
+    """Run a review, reusing the result of an identical earlier request."""
+    # The status box is created here so a cached result can replay it
+    with st.status(
+        "Reviewing code... This may take a few minutes.", expanded=True
+    ) as status:
+
+        def show_progress(name: str, agent_result: dict):
+            """Report each agent in the status box as it finishes."""
+            label = name.replace("_", " ").title()
+            if agent_result.get("error"):
+                status.write(f"{label} failed: {agent_result['error']}")
+            else:
+                status.write(f"{label} finished")
+
+        result = _orchestrator.review(
+            code=code,
+            language=language,
+            include_agents=list(agents),
+            on_agent_complete=show_progress,
+        )
+        status.update(label="Code review complete!", state="complete")
+
+    # Raising keeps reviews with failed agents out of the cache, so pressing
+    # the button again retries them
+    if result.get("summary", {}).get("agents_failed"):
+        raise _IncompleteReview(result)
+
+    return result
 
 
 def main():
@@ -138,33 +206,42 @@ def render_code_input(selected_agents: list, language: str):
             st.warning("Please select at least one agent to run.")
             return
 
-        with st.spinner("Reviewing code... This may take a few minutes."):
+        try:
             try:
-                result = st.session_state.orchestrator.review(
-                    code=code, language=language, include_agents=selected_agents
+                result = _run_review(
+                    get_orchestrator(),
+                    code,
+                    language,
+                    tuple(sorted(selected_agents)),
                 )
+            except _IncompleteReview as incomplete:
+                result = incomplete.result
 
-                st.session_state.review_result = result
-                st.success("Code review complete!")
-                st.rerun()
-
-            except Exception as e:
-                st.error(f"Review failed: {str(e)}")
-                st.exception(e)
+            st.session_state.review_result = result
 
-                error_msg = str(e).lower()
-                if "api key" in error_msg:
-                    st.info(
-                        "Tip: Make sure your Gemini API key is set in the .env file."
-                    )
-                elif "timeout" in error_msg:
-                    st.info(
-                        "Tip: The request timed out. Try again or simplify your code."
-                    )
-                elif "rate limit" in error_msg:
-                    st.info(
-                        "Tip: API rate limit exceeded. Please wait a moment and try again."
-                    )
+            # Render every report format once instead of on each rerun
+            report_generator = get_report_generator()
+            st.session_state.reports = {
+                format_type: report_generator.generate_report(
+                    result, format_type=format_type
+                )
+                for format_type in ("markdown", "text", "json")
+            }
+            st.rerun()
+
+        except Exception as e:
+            st.error(f"Review failed: {str(e)}")
+            st.exception(e)
+
+            error_msg = str(e).lower()
+            if "api key" in error_msg:
+                st.info("Tip: Make sure your Gemini API key is set in the .env file.")
+            elif "timeout" in error_msg:
+                st.info("Tip: The request timed out. Try again or simplify your code.")
+            elif "rate limit" in error_msg:
+                st.info(
+                    "Tip: API rate limit exceeded. Please wait a moment and try again."
+                )
 
 
 def render_review_results():
@@ -342,12 +419,9 @@ def render_report():
             "Report Format", ["Markdown", "Text", "JSON"], key="report_format"
         )
 
-    # Generate report
-    report_generator = ReportGenerator()
+    # Reports are rendered once when the review completes
     format_map = {"Markdown": "markdown", "Text": "text", "JSON": "json"}
-    report = report_generator.generate_report(
-        result, format_type=format_map[report_format]
-    )
+    report = st.session_state.reports[format_map[report_format]]
 
     # Display report
     if report_format == "JSON":
@@ -0,0 +1,29 @@
+"""Shared fixtures: reviews run against a fake chat model, never Gemini."""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from backend.agents.base_agent import _get_llm
+from backend.utils import gemini_client
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Replace the Gemini client with a fake model.
+
+    Call the fixture's value with the replies the model should cycle
+    through; agents created afterwards use them.
+    """
+
+    def use_responses(*responses):
+        monkeypatch.setattr(
+            gemini_client,
+            "create_llm",
+            lambda **_: FakeListChatModel(responses=list(responses)),
+        )
+        _get_llm.cache_clear()
+
+    use_responses("No issues found.")
+    yield use_responses
+    _get_llm.cache_clear()
@@ -0,0 +1,120 @@
+"""Tests for the AST analyzer's structure extraction."""
+
+from backend.tools.ast_analyzer import ASTAnalyzer
+
+CODE = '''import os
+from . import sibling
+from collections import OrderedDict as OD
+
+
+@decorator
+def top(a, b=1):
+    if a:
+        for i in b:
+            pass
+    return a
+
+
+class Base(object):
+    """Doc."""
+
+    def method(self):
+        while True:
+            break
+
+    if True:
+        def conditional(self):
+            pass
+
+    try:
+        def guarded(self):
+            pass
+    except ImportError:
+        pass
+
+
+async def coro():
+    async with x:
+        pass
+'''
+
+
+def test_functions():
+    result = ASTAnalyzer().parse(CODE)
+
+    functions = {function["name"]: function for function in result["functions"]}
+    assert set(functions) == {"top", "method", "conditional", "guarded", "coro"}
+    assert functions["top"] == {
+        "name": "top",
+        "line": 7,
+        "args": 2,
+        "decorators": ["decorator"],
+        "has_docstring": False,
+    }
+    assert functions["coro"]["line"] == 32
+
+
+def test_classes_include_nested_methods():
+    result = ASTAnalyzer().parse(CODE)
+
+    assert result["classes"] == [
+        {
+            "name": "Base",
+            "line": 14,
+            "methods": ["method", "conditional", "guarded"],
+            "method_count": 3,
+            "has_docstring": True,
+        }
+    ]
+
+
+def test_imports():
+    result = ASTAnalyzer().parse(CODE)
+
+    assert result["imports"] == [
+        {"type": "import", "module": "os", "alias": None, "line": 1},
+        {
+            "type": "from_import",
+            "module": "",
+            "names": ["sibling"],
+            "line": 2,
+            "level": 1,
+        },
+        {
+            "type": "from_import",
+            "module": "collections",
+            "names": ["OrderedDict"],
+            "line": 3,
+            "level": 0,
+        },
+    ]
+
+
+def test_complexity():
+    result = ASTAnalyzer().parse(CODE)
+
+    # One path plus if, for, while, the class-level if, try and async with
+    assert result["complexity"]["cyclomatic"] == 7
+    assert result["complexity"]["function_count"] == 5
+    assert result["complexity"]["class_count"] == 1
+
+
+def test_syntax_error():
+    result = ASTAnalyzer().parse("def f(:\n    pass\n")
+
+    assert result["valid"] is False
+    assert result["error_type"] == "SyntaxError"
+    assert result["line"] == 1
+
+
+def test_cached_results_are_not_shared():
+    analyzer = ASTAnalyzer()
+    first = analyzer.parse(CODE)
+    first["functions"].clear()
+    first["classes"][0]["methods"].append("extra")
+
+    second = analyzer.parse(CODE)
+
+    assert len(second["functions"]) == 5
+    assert second["classes"][0]["methods"] == ["method", "conditional", "guarded"]
+    assert second["ast_tree"] is first["ast_tree"]
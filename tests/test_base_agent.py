@@ -0,0 +1,32 @@
+"""Tests for the agents' shared review cache."""
+
+from backend.agents.documentation_agent import DocumentationAgent
+
+# Fully documented, so the local scan settles the review without the LLM
+CODE = '''"""Module."""
+
+
+def f():
+    """Return one."""
+    return 1
+'''
+
+
+def test_cached_result_is_isolated_from_callers(fake_llm):
+    agent = DocumentationAgent()
+
+    first = agent.review(CODE, force_llm=True)
+    first["issues"].append({"type": "injected"})
+
+    assert {"type": "injected"} not in agent.review(CODE, force_llm=True)["issues"]
+
+
+def test_review_options_are_part_of_the_cache_key(fake_llm):
+    fake_llm("Missing docstring for function f (line 4)")
+    agent = DocumentationAgent()
+
+    asked = agent.review(CODE, force_llm=True)
+    skipped = agent.review(CODE)
+
+    assert skipped["analysis"] != asked["analysis"]
+    assert asked["analysis"] == "Missing docstring for function f (line 4)"
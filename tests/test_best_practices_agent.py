@@ -0,0 +1,56 @@
+"""Tests for the best practices agent's structural checks."""
+
+import ast
+
+from backend.agents.best_practices_agent import BestPracticesAgent
+
+DUPLICATED = '''
+def load_users(path):
+    """Load users."""
+    with open(path) as f:
+        rows = f.readlines()
+    rows = [row.strip() for row in rows]
+    return [row for row in rows if row]
+
+
+def load_groups(path):
+    with open(path) as f:
+        rows = f.readlines()
+    rows = [row.strip() for row in rows]
+    return [row for row in rows if row]
+'''
+
+
+def find_duplicates(code):
+    return BestPracticesAgent()._find_duplicate_functions(ast.parse(code))
+
+
+def test_identical_bodies_are_reported():
+    duplicates = find_duplicates(DUPLICATED)
+
+    assert len(duplicates) == 1
+    assert duplicates[0]["type"] == "potential_duplication"
+    assert duplicates[0]["line"] == 10
+    assert "'load_users', 'load_groups'" in duplicates[0]["message"]
+
+
+def test_short_bodies_are_not_reported():
+    code = '''
+def get_name(self):
+    """Name."""
+    value = self._name
+    return value
+
+
+def get_title(self):
+    value = self._name
+    return value
+'''
+
+    assert find_duplicates(code) == []
+
+
+def test_different_bodies_are_not_reported():
+    code = DUPLICATED.replace("row.strip()", "row.lower()", 1)
+
+    assert find_duplicates(code) == []
@@ -0,0 +1,73 @@
+"""Tests for the combined agent's single-call review."""
+
+import json
+
+from backend.agents.combined_agent import CombinedReviewAgent
+
+CODE = "def f(x):\n    return eval(x)\n"
+
+
+def test_parse_sections_splits_json_reply():
+    agent = CombinedReviewAgent()
+    reply = json.dumps(
+        {
+            "security": "Security issue (high): eval on line 2",
+            "style": ["Style issue (low): a", "Style issue (low): b"],
+        }
+    )
+
+    sections = agent._parse_sections(reply, ("security", "performance", "style"))
+
+    assert sections == {
+        "security": "Security issue (high): eval on line 2",
+        "performance": "",
+        "style": "Style issue (low): a\nStyle issue (low): b",
+    }
+
+
+def test_parse_sections_strips_code_fence():
+    agent = CombinedReviewAgent()
+    reply = '```json\n{"security": "Security issue (high): x"}\n```'
+
+    sections = agent._parse_sections(reply, ("security",))
+
+    assert sections == {"security": "Security issue (high): x"}
+
+
+def test_parse_sections_rejects_malformed_reply():
+    agent = CombinedReviewAgent()
+
+    assert agent._parse_sections("Security issue (high): x", ("security",)) is None
+    assert agent._parse_sections('["security"]', ("security",)) is None
+
+
+def test_review_gives_each_section_its_own_text(fake_llm):
+    fake_llm(
+        json.dumps(
+            {
+                "security": "Security issue (high): eval on line 2",
+                "performance": "",
+                "style": "",
+            }
+        )
+    )
+
+    result = CombinedReviewAgent().review(CODE)
+
+    assert result["sections_parsed"] is True
+    assert set(result["results"]) == {"performance", "security", "style"}
+    assert result["results"]["security"]["analysis"] == (
+        "Security issue (high): eval on line 2"
+    )
+    assert result["results"]["style"]["analysis"] == ""
+
+
+def test_review_falls_back_to_full_text_per_section(fake_llm):
+    reply = "Security issue (high): eval on line 2"
+    fake_llm(reply)
+
+    result = CombinedReviewAgent().review(CODE)
+
+    assert result["sections_parsed"] is False
+    for section_result in result["results"].values():
+        assert section_result["analysis"] == reply
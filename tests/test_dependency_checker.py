@@ -0,0 +1,52 @@
+"""Tests for dependency extraction."""
+
+from backend.tools.ast_analyzer import ASTAnalyzer
+from backend.tools.dependency_checker import DependencyChecker
+
+CODE = """import os.path
+from . import sibling
+from .models import User
+from ..utils import helper
+
+
+def load():
+    import json
+    from collections import OrderedDict
+
+    return json, OrderedDict
+"""
+
+
+def check(code):
+    ast_result = ASTAnalyzer().parse(code)
+    return DependencyChecker().check_dependencies(code, ast_result=ast_result)
+
+
+def test_dependencies_from_ast_imports():
+    result = check(CODE)
+
+    assert result["dependencies"] == [
+        {"module": "os", "line": 1},
+        {"module": "json", "line": 8},
+        {"module": "collections", "line": 9},
+    ]
+    assert result["dependency_count"] == 3
+
+
+def test_relative_imports_are_skipped():
+    result = check("from . import a\nfrom .b import c\nfrom ..d.e import f\n")
+
+    assert result["dependencies"] == []
+
+
+def test_unparseable_code_falls_back_to_line_scan():
+    code = "import requests\nfrom yaml import safe_load\ndef f(:\n"
+
+    result = DependencyChecker().check_dependencies(
+        code, ast_result=ASTAnalyzer().parse(code)
+    )
+
+    assert result["dependencies"] == [
+        {"module": "requests", "line": 1},
+        {"module": "yaml", "line": 2},
+    ]
@@ -0,0 +1,124 @@
+"""Tests for the orchestrator's agent scheduling."""
+
+import json
+import threading
+
+import pytest
+
+from backend.core.orchestrator import CodeReviewOrchestrator
+
+CODE = "def f(x):\n    return eval(x)\n"
+
+
+@pytest.fixture
+def orchestrator(monkeypatch, fake_llm):
+    monkeypatch.delenv("CODE_REVIEW_CACHE", raising=False)
+    return CodeReviewOrchestrator()
+
+
+def spy_on_reviews(monkeypatch, orchestrator, names):
+    """Record which individual agents' review() is called."""
+    calls = []
+    for name in names:
+        agent = getattr(orchestrator, f"{name}_agent")
+
+        def review(*args, _name=name, _review=agent.review, **kwargs):
+            calls.append(_name)
+            return _review(*args, **kwargs)
+
+        monkeypatch.setattr(agent, "review", review)
+    return calls
+
+
+def test_batched_review_uses_combined_reply(monkeypatch, fake_llm, orchestrator):
+    fake_llm(json.dumps({"security": "Security issue (high): eval on line 2"}))
+    calls = spy_on_reviews(monkeypatch, orchestrator, ["security", "style"])
+
+    result = orchestrator.review(
+        CODE, include_agents=["security", "style"], batched=True
+    )
+
+    assert calls == []
+    assert set(result["agent_results"]) == {"security", "style"}
+    assert result["agent_results"]["security"]["analysis"] == (
+        "Security issue (high): eval on line 2"
+    )
+
+
+def test_batched_review_falls_back_to_each_agent(monkeypatch, fake_llm, orchestrator):
+    fake_llm("Security issue (high): eval on line 2")
+    calls = spy_on_reviews(monkeypatch, orchestrator, ["security", "style"])
+
+    result = orchestrator.review(
+        CODE, include_agents=["security", "style"], batched=True
+    )
+
+    assert sorted(calls) == ["security", "style"]
+    assert list(result["agent_results"]) == ["security", "style"]
+    assert result["summary"]["agents_failed"] == 0
+
+
+def test_fail_fast_runs_only_syntax_agent(fake_llm, orchestrator):
+    fake_llm("Syntax error: missing parenthesis on line 1")
+
+    result = orchestrator.review("def f(:\n    pass\n")
+
+    agent_results = result["agent_results"]
+    assert "error" not in agent_results["syntax"]
+    for name in (
+        "security",
+        "performance",
+        "style",
+        "best_practices",
+        "documentation",
+    ):
+        assert agent_results[name] == {
+            "skipped": True,
+            "reason": "Code has syntax errors",
+        }
+    # Skipped agents are never constructed
+    assert "security_agent" not in vars(orchestrator)
+
+
+def test_fail_fast_respects_include_agents(fake_llm, orchestrator):
+    result = orchestrator.review("def f(:\n    pass\n", include_agents=["style"])
+
+    assert list(result["agent_results"]) == ["style"]
+    assert not result["agent_results"]["style"].get("skipped")
+
+
+def test_fail_fast_disabled_runs_every_agent(fake_llm, orchestrator):
+    result = orchestrator.review("def f(:\n    pass\n", fail_fast=False)
+
+    assert len(result["agent_results"]) == 6
+    assert not any(r.get("skipped") for r in result["agent_results"].values())
+
+
+def test_on_agent_complete_reports_each_agent(fake_llm, orchestrator):
+    calls = []
+
+    def on_agent_complete(name, result):
+        calls.append((name, result, threading.current_thread()))
+
+    result = orchestrator.review(
+        CODE, include_agents=["security", "style"], on_agent_complete=on_agent_complete
+    )
+
+    assert sorted(name for name, _, _ in calls) == ["security", "style"]
+    for name, agent_result, thread in calls:
+        assert agent_result is result["agent_results"][name]
+        assert thread is threading.current_thread()
+
+
+def test_on_agent_complete_after_batched_review(fake_llm, orchestrator):
+    fake_llm(json.dumps({"security": "Security issue (high): eval on line 2"}))
+    calls = []
+
+    orchestrator.review(
+        CODE,
+        include_agents=["security", "style"],
+        batched=True,
+        on_agent_complete=lambda name, result: calls.append(name),
+    )
+
+    assert calls == ["security", "style"]
@@ -0,0 +1,40 @@
+"""Tests for the performance agent's structural checks."""
+
+import ast
+
+from backend.agents.performance_agent import PerformanceAgent
+
+
+def nested_loop_issues(code):
+    issues = PerformanceAgent()._identify_performance_patterns(
+        code.split("\n"), "python", {}, ast.parse(code)
+    )
+    return [issue for issue in issues if issue["type"] == "nested_loops"]
+
+
+def test_single_loop_is_not_reported():
+    assert nested_loop_issues("for a in x:\n    pass\n") == []
+
+
+def test_double_nesting_is_medium_impact():
+    code = "for a in x:\n    for b in y:\n        pass\n"
+
+    (issue,) = nested_loop_issues(code)
+
+    assert issue["impact"] == "medium"
+    assert issue["line"] == 2
+
+
+def test_triple_nesting_is_high_impact():
+    code = "for a in x:\n    while a:\n        for b in y:\n            pass\n"
+
+    (issue,) = nested_loop_issues(code)
+
+    assert issue["impact"] == "high"
+    assert issue["message"] == "Loops nested 3 deep"
+
+
+def test_nested_function_resets_depth():
+    code = "for a in x:\n    def f():\n        for b in y:\n            pass\n"
+
+    assert nested_loop_issues(code) == []
@@ -0,0 +1,64 @@
+"""Tests for the persistent review result cache."""
+
+import pickle
+
+from backend.core.result_cache import ReviewResultCache
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "cache.db")
+    result = {
+        "code": "x = 1\n",
+        "agent_results": {"style": {"issues": [], "style_score": 10.0}},
+        "summary": {"total_issues": 0},
+    }
+
+    ReviewResultCache(path).set("key", result)
+    # A second connection sees the stored entry, as a later run would
+    cached = ReviewResultCache(path).get("key")
+
+    assert cached == result
+
+
+def test_set_replaces_entry(tmp_path):
+    cache = ReviewResultCache(str(tmp_path / "cache.db"))
+
+    cache.set("key", {"summary": {"total_issues": 1}})
+    cache.set("key", {"summary": {"total_issues": 2}})
+
+    assert cache.get("key") == {"summary": {"total_issues": 2}}
+
+
+def test_missing_key_is_a_miss(tmp_path):
+    assert ReviewResultCache(str(tmp_path / "cache.db")).get("key") is None
+
+
+def test_corrupt_row_is_a_miss(tmp_path):
+    cache = ReviewResultCache(str(tmp_path / "cache.db"))
+    for key, payload in (
+        ("text", "not json"),
+        ("pickle", pickle.dumps({"summary": {}})),
+    ):
+        cache._conn.execute(
+            "INSERT INTO review_cache (key, ts, payload) VALUES (?, ?, ?)",
+            (key, 0, payload),
+        )
+    cache._conn.commit()
+
+    assert cache.get("text") is None
+    assert cache.get("pickle") is None
+
+
+def test_oldest_entries_are_pruned(tmp_path):
+    cache = ReviewResultCache(str(tmp_path / "cache.db"), max_entries=2)
+
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.set("a", {"n": 3})
+    cache.set("c", {"n": 4})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 3}
+    assert cache.get("c") == {"n": 4}
+    count = cache._conn.execute("SELECT COUNT(*) FROM review_cache").fetchone()
+    assert count == (2,)